@@ -1,6 +1,7 @@
 """Custom status line for Claude Code with ML-focused metrics.
 
-Inspired by zen-nv, uses nvitop for GPU stats and psutil for system metrics.
+Inspired by zen-nv; CPU/GPU sampling and the gradient palette come from the
+shared zen_metrics collector (nvitop + psutil) so both tools share one hot path.
 """
 
 from __future__ import annotations
@@ -17,32 +18,15 @@ from rich.console import Console
 from rich.style import Style
 from rich.text import Text
 
-try:
-    from nvitop import Device
-
-    HAS_NVITOP = True
-except ImportError:
-    HAS_NVITOP = False
-
-# Tokyo Night inspired muted palette
-COLORS = {
-    "blue": "#7aa2f7",
-    "green": "#9ece6a",
-    "yellow": "#e0af68",
-    "red": "#f7768e",
-    "magenta": "#bb9af7",
-    "cyan": "#7dcfff",
-    "orange": "#ff9e64",
-    "gray": "#565f89",
-    "white": "#c0caf5",
-    "dim": "#3b4261",
-    "separator": "#545c7e",
-}
+from zen_metrics import COLORS, HAS_NVITOP, Collector, HostSnapshot, gradient_color, temp_gradient_color
 
 # Separators (compact)
 SEP = "│"  # Main separator between segment groups
 SUBSEP = ""  # Sub-separator within segments
 
+# Devices are enumerated once per invocation and shared by every GPU segment
+collector = Collector()
+
 
 def style(color: str, bold: bool = False, dim: bool = False) -> Style:
     """Create a style with the given color from palette."""
@@ -57,69 +41,6 @@ def read_claude_context() -> dict[str, object] | None:
         return None
 
 
-def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
-    """Convert hex color to RGB tuple."""
-    hex_color = hex_color.lstrip("#")
-    return tuple(int(hex_color[i : i + 2], 16) for i in (0, 2, 4))
-
-
-def rgb_to_hex(r: int, g: int, b: int) -> str:
-    """Convert RGB tuple to hex color."""
-    return f"#{r:02x}{g:02x}{b:02x}"
-
-
-def lerp_color(color1: str, color2: str, t: float) -> str:
-    """Linearly interpolate between two hex colors."""
-    r1, g1, b1 = hex_to_rgb(color1)
-    r2, g2, b2 = hex_to_rgb(color2)
-    r = int(r1 + (r2 - r1) * t)
-    g = int(g1 + (g2 - g1) * t)
-    b = int(b1 + (b2 - b1) * t)
-    return rgb_to_hex(r, g, b)
-
-
-def gradient_color(pct: float, inverse: bool = False) -> str:
-    """
-    Get a gradient color based on percentage (0-100).
-
-    Colors transition: green -> yellow -> orange -> red
-    If inverse=True, low values are bad (e.g., for disk space).
-    """
-    if inverse:
-        pct = 100 - pct
-
-    pct = max(0, min(100, pct))
-
-    # Define color stops
-    green = COLORS["green"]
-    yellow = COLORS["yellow"]
-    orange = COLORS["orange"]
-    red = COLORS["red"]
-
-    if pct <= 25:
-        # Green zone - pure green
-        return green
-    elif pct <= 50:
-        # Green to yellow transition
-        t = (pct - 25) / 25
-        return lerp_color(green, yellow, t)
-    elif pct <= 75:
-        # Yellow to orange transition
-        t = (pct - 50) / 25
-        return lerp_color(yellow, orange, t)
-    else:
-        # Orange to red transition
-        t = (pct - 75) / 25
-        return lerp_color(orange, red, t)
-
-
-def temp_gradient_color(temp_c: float) -> str:
-    """Get gradient color for temperature (Celsius)."""
-    # Map temperature to percentage: 30°C = 0%, 90°C = 100%
-    pct = ((temp_c - 30) / 60) * 100
-    return gradient_color(pct)
-
-
 def power_gradient_color(power_pct: float) -> str:
     """Get gradient color for power percentage."""
     return gradient_color(power_pct)
@@ -370,9 +291,9 @@ def build_session_segment() -> Text | None:
 
 
 # --- CPU Segment (using psutil) ---
-def build_cpu_segment() -> Text | None:
+def build_cpu_segment(host: HostSnapshot) -> Text | None:
     """Build CPU segment - only show if load is notable (>25%)."""
-    cpu_pct = psutil.cpu_percent(interval=None)
+    cpu_pct = host.cpu_percent
 
     if cpu_pct < 25:
         return None
@@ -386,16 +307,15 @@ def build_cpu_segment() -> Text | None:
 
 
 # --- Memory Segment (using psutil) ---
-def build_memory_segment() -> Text | None:
+def build_memory_segment(host: HostSnapshot) -> Text | None:
     """Build memory segment - only show if usage is notable (>50%)."""
-    mem = psutil.virtual_memory()
-    pct = mem.percent
+    pct = host.ram_percent
 
     if pct < 50:
         return None
 
-    used_gb = mem.used / (1024**3)
-    total_gb = mem.total / (1024**3)
+    used_gb = host.ram_used / (1024**3)
+    total_gb = host.ram_total / (1024**3)
 
     color = gradient_color(pct)
 
@@ -407,98 +327,76 @@ def build_memory_segment() -> Text | None:
     return text
 
 
-# --- GPU Segment (using nvitop) ---
+# --- GPU Segment (using the shared collector) ---
 def build_gpu_segment() -> Text | None:
     """Build GPU segment with utilization, memory, temp, and power."""
-    if not HAS_NVITOP:
+    if not HAS_NVITOP or not collector.devices:
         return None
 
-    try:
-        devices = Device.all()
-        if not devices:
-            return None
+    gpu = collector.gpu(collector.devices[0])
 
-        device = devices[0]
+    util = gpu.util or 0
+    mem_used = gpu.mem_used or 0
+    mem_total = gpu.mem_total or 1
+    mem_pct = gpu.mem_percent
 
-        util = device.gpu_utilization() or 0
-        mem_used = device.memory_used() or 0
-        mem_total = device.memory_total() or 1
-        mem_pct = (mem_used / mem_total) * 100 if mem_total else 0
+    temp_c = gpu.temp_c or 0
+    power = gpu.power_w or 0
 
-        temp_c = device.temperature() or 0
-        power = (device.power_usage() or 0) / 1000
-        power_limit = (device.power_limit() or 0) / 1000
+    # Gradient colors for each metric
+    gpu_color = gradient_color(util)
+    vram_color = gradient_color(mem_pct)
+    temp_color = temp_gradient_color(temp_c)
+    pwr_color = power_gradient_color(gpu.power_percent or 0)
 
-        # Gradient colors for each metric
-        gpu_color = gradient_color(util)
-        vram_color = gradient_color(mem_pct)
-        temp_color = temp_gradient_color(temp_c)
-        power_pct = (power / power_limit * 100) if power_limit else 0
-        pwr_color = power_gradient_color(power_pct)
-
-        mem_used_gb = mem_used / (1024**3)
-        mem_total_gb = mem_total / (1024**3)
-        temp_f = (temp_c * 9 / 5) + 32
-
-        text = Text()
-        # Compact format: GPU 7% 3/32G 118F 50W
-        text.append("GPU ", style=style("green"))
-        text.append(f"{util}%", style=Style(color=gpu_color))
-        text.append(" ", style=style("dim"))
-        text.append(f"{mem_used_gb:.0f}", style=Style(color=vram_color))
-        text.append("/", style=style("dim"))
-        text.append(f"{mem_total_gb:.0f}G", style=Style(color=vram_color, dim=True))
-        text.append(" ", style=style("dim"))
-        text.append(f"{temp_f:.0f}°F", style=Style(color=temp_color))
-        text.append(" ", style=style("dim"))
-        text.append(f"{power:.0f}W", style=Style(color=pwr_color))
+    mem_used_gb = mem_used / (1024**3)
+    mem_total_gb = mem_total / (1024**3)
+    temp_f = (temp_c * 9 / 5) + 32
 
-        return text
+    text = Text()
+    # Compact format: GPU 7% 3/32G 118F 50W
+    text.append("GPU ", style=style("green"))
+    text.append(f"{util}%", style=Style(color=gpu_color))
+    text.append(" ", style=style("dim"))
+    text.append(f"{mem_used_gb:.0f}", style=Style(color=vram_color))
+    text.append("/", style=style("dim"))
+    text.append(f"{mem_total_gb:.0f}G", style=Style(color=vram_color, dim=True))
+    text.append(" ", style=style("dim"))
+    text.append(f"{temp_f:.0f}°F", style=Style(color=temp_color))
+    text.append(" ", style=style("dim"))
+    text.append(f"{power:.0f}W", style=Style(color=pwr_color))
 
-    except Exception:
-        return None
+    return text
 
 
 def build_multi_gpu_segment() -> Text | None:
     """Build segment showing all GPUs in a compact format."""
-    if not HAS_NVITOP:
+    if not HAS_NVITOP or not collector.devices:
         return None
 
-    try:
-        devices = Device.all()
-        if not devices:
-            return None
-
-        if len(devices) == 1:
-            return build_gpu_segment()
-
-        # Multi-GPU: show compact summary for each
-        text = Text()
-        text.append("GPUs:", style=style("green"))
-        text.append(" ", style=style("dim"))
-
-        for i, device in enumerate(devices):
-            if i > 0:
-                text.append("  ", style=style("dim"))
+    if len(collector.devices) == 1:
+        return build_gpu_segment()
 
-            util = device.gpu_utilization() or 0
-            mem_used = device.memory_used() or 0
-            mem_total = device.memory_total() or 1
-            mem_pct = (mem_used / mem_total) * 100
+    # Multi-GPU: show compact summary for each
+    text = Text()
+    text.append("GPUs:", style=style("green"))
+    text.append(" ", style=style("dim"))
 
-            gpu_color = gradient_color(util)
-            vram_color = gradient_color(mem_pct)
+    for i, gpu in enumerate(collector.gpus()):
+        if i > 0:
+            text.append("  ", style=style("dim"))
 
-            mem_gb = mem_used / (1024**3)
-            text.append(f"[{i}]", style=style("gray"))
-            text.append(f"{util}%", style=Style(color=gpu_color))
-            text.append("/", style=style("dim"))
-            text.append(f"{mem_gb:.0f}G", style=Style(color=vram_color, dim=True))
+        util = gpu.util or 0
+        gpu_color = gradient_color(util)
+        vram_color = gradient_color(gpu.mem_percent)
 
-        return text
+        mem_gb = (gpu.mem_used or 0) / (1024**3)
+        text.append(f"[{i}]", style=style("gray"))
+        text.append(f"{util}%", style=Style(color=gpu_color))
+        text.append("/", style=style("dim"))
+        text.append(f"{mem_gb:.0f}G", style=Style(color=vram_color, dim=True))
 
-    except Exception:
-        return None
+    return text
 
 
 # --- Disk Warning ---
@@ -581,8 +479,9 @@ def main() -> None:
             line.append_text(session_seg)
 
     # System resources
-    cpu_seg = build_cpu_segment()
-    mem_seg = build_memory_segment()
+    host = collector.host()
+    cpu_seg = build_cpu_segment(host)
+    mem_seg = build_memory_segment(host)
     gpu_seg = build_multi_gpu_segment()
     disk_seg = build_disk_warning()
 
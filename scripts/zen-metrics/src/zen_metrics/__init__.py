@@ -0,0 +1,31 @@
+"""Shared CPU/GPU metrics collection for zen-nv and the Claude statusline."""
+
+from zen_metrics.collector import HAS_NVITOP, Collector
+from zen_metrics.colors import COLORS, gradient_color, lerp_color, temp_gradient_color
+from zen_metrics.snapshots import (
+    THROTTLE_REASONS,
+    GpuBurst,
+    GpuDiagnostics,
+    GpuProcessSnapshot,
+    GpuSnapshot,
+    GpuStatic,
+    HostSnapshot,
+    SampleStats,
+)
+
+__all__ = [
+    "COLORS",
+    "HAS_NVITOP",
+    "THROTTLE_REASONS",
+    "Collector",
+    "GpuBurst",
+    "GpuDiagnostics",
+    "GpuProcessSnapshot",
+    "GpuSnapshot",
+    "GpuStatic",
+    "HostSnapshot",
+    "SampleStats",
+    "gradient_color",
+    "lerp_color",
+    "temp_gradient_color",
+]
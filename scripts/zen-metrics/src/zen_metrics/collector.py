@@ -0,0 +1,279 @@
+"""Batched CPU/GPU sampling with cached static device properties."""
+
+from __future__ import annotations
+
+from contextlib import nullcontext as _nullcontext
+from typing import Any, Callable
+
+import psutil
+
+from zen_metrics.snapshots import (
+    GpuBurst,
+    GpuDiagnostics,
+    GpuProcessSnapshot,
+    GpuSnapshot,
+    GpuStatic,
+    HostSnapshot,
+    SampleStats,
+)
+
+try:
+    from nvitop import Device, libnvml
+
+    HAS_NVITOP = True
+except ImportError:
+    HAS_NVITOP = False
+
+
+def number(value: Any) -> Any:
+    """Return value if numeric, else None (NVML reports unsupported fields as N/A strings)."""
+    return value if isinstance(value, (int, float)) else None
+
+
+def query(fn: Callable[[], Any]) -> Any:
+    """Call an NVML-backed getter, mapping errors and N/A to None."""
+    try:
+        return number(fn())
+    except Exception:
+        return None
+
+
+def process_gpu_memory(proc: Any) -> int | None:
+    """Safe getter for gpu_memory (property on some nvitop versions, method on others)."""
+    val = getattr(proc, "gpu_memory", None)
+    if callable(val):
+        try:
+            val = val()
+        except Exception:
+            return None
+    return number(val)
+
+
+# nvmlValueType_t -> c_nvmlValue_t union member
+_SAMPLE_FIELDS = {
+    0: "dVal",
+    1: "uiVal",
+    2: "ulVal",
+    3: "ullVal",
+    4: "sllVal",
+    5: "siVal",
+    6: "usVal",
+}
+
+
+class Collector:
+    """Shared sampling front-end over nvitop and psutil.
+
+    Devices are enumerated once and their static properties (name, total
+    memory, power limit, bus id) cached; dynamic reads for a device happen
+    inside one `Device.oneshot()` block so NVML is hit once per query kind.
+    Any NVML failure degrades to None fields or an empty device list rather
+    than raising into the caller's render loop.
+    """
+
+    def __init__(self, devices: list[Any] | None = None) -> None:
+        # An explicit device list (simulations, tests) skips NVML enumeration
+        self._devices: list[Any] | None = devices
+        self._static: dict[int, GpuStatic] = {}
+        self._max_clocks: dict[int, tuple[int | None, int | None]] = {}
+        self._sample_ts: dict[tuple[int, str], int] = {}
+        self._pcie_counters: dict[int, tuple[Any, int, Any, int]] = {}
+
+    @property
+    def devices(self) -> list[Any]:
+        if self._devices is None:
+            self._devices = []
+            if HAS_NVITOP:
+                try:
+                    self._devices = Device.all()
+                except Exception:
+                    pass
+        return self._devices
+
+    def static(self, device: Any) -> GpuStatic:
+        info = self._static.get(device.index)
+        if info is None:
+            try:
+                name = device.name()
+            except Exception:
+                name = f"GPU {device.index}"
+            try:
+                bus_id = device.bus_id()
+            except Exception:
+                bus_id = None
+            info = self._static[device.index] = GpuStatic(
+                index=device.index,
+                name=name if isinstance(name, str) else f"GPU {device.index}",
+                mem_total=query(device.memory_total),
+                power_limit_mw=query(device.power_limit),
+                bus_id=bus_id if isinstance(bus_id, str) else None,
+            )
+        return info
+
+    def refresh_static(self) -> None:
+        """Drop cached static properties (e.g. after a power limit change)."""
+        self._static.clear()
+        self._max_clocks.clear()
+
+    def host(self, cpu_interval: float | None = None) -> HostSnapshot:
+        cpu = psutil.cpu_percent(interval=cpu_interval)
+        mem = psutil.virtual_memory()
+        return HostSnapshot(cpu_percent=cpu, ram_percent=mem.percent, ram_used=mem.used, ram_total=mem.total)
+
+    def gpu(self, device: Any) -> GpuSnapshot:
+        static = self.static(device)
+        try:
+            batch = device.oneshot()
+        except Exception:
+            batch = None
+        with batch if batch is not None else _nullcontext():
+            return self._read_gpu(device, static)
+
+    def _read_gpu(self, device: Any, static: GpuStatic) -> GpuSnapshot:
+        return GpuSnapshot(
+            static=static,
+            util=query(device.gpu_utilization),
+            mem_used=query(device.memory_used),
+            temp_c=query(device.temperature),
+            fan=query(device.fan_speed),
+            power_mw=query(device.power_usage),
+        )
+
+    def diagnostics(self, device: Any) -> GpuDiagnostics:
+        """PCIe/NVLink throughput, clocks vs max and throttle reasons in one batched read.
+
+        Both throughputs are diffs of cumulative counters since the previous
+        call, so nothing here blocks on NVML's 20 ms PCIe sampling window.
+        """
+        max_clocks = self._max_clocks.get(device.index)
+        if max_clocks is None:
+            max_clocks = self._max_clocks[device.index] = (
+                query(device.max_sm_clock),
+                query(device.max_memory_clock),
+            )
+        try:
+            batch = device.oneshot()
+        except Exception:
+            batch = None
+        with batch if batch is not None else _nullcontext():
+            # One counter read for both directions; it diffs against the previous call
+            try:
+                nvlink_tx, nvlink_rx = (number(v) for v in device.nvlink_total_throughput())
+            except Exception:
+                nvlink_tx = nvlink_rx = None
+            pcie_tx, pcie_rx = self._pcie_throughput(device)
+            return GpuDiagnostics(
+                index=device.index,
+                pcie_tx=pcie_tx,
+                pcie_rx=pcie_rx,
+                nvlink_tx=nvlink_tx,
+                nvlink_rx=nvlink_rx,
+                sm_clock=query(device.sm_clock),
+                mem_clock=query(device.memory_clock),
+                max_sm_clock=max_clocks[0],
+                max_mem_clock=max_clocks[1],
+                throttle=self._throttle_reasons(device),
+            )
+
+    def _pcie_throughput(self, device: Any) -> tuple[int | None, int | None]:
+        """PCIe TX/RX in KiB/s from the driver's byte counters; (None, None) on the first call.
+
+        nvmlDeviceGetPcieThroughput (behind nvitop's pcie_*_throughput) sleeps
+        through a 20 ms sample per direction; the counters are one non-blocking
+        field read. Drivers without the counters report N/A.
+        """
+        if not HAS_NVITOP:
+            return None, None
+        try:
+            (tx, tx_ts), (rx, rx_ts) = libnvml.nvmlQueryFieldValues(
+                device.handle,
+                [libnvml.NVML_FI_DEV_PCIE_COUNT_TX_BYTES, libnvml.NVML_FI_DEV_PCIE_COUNT_RX_BYTES],
+            )
+        except Exception:
+            return None, None
+        current = (number(tx), tx_ts, number(rx), rx_ts)
+        prev = self._pcie_counters.get(device.index)
+        self._pcie_counters[device.index] = current
+        if prev is None:
+            return None, None
+
+        def rate(value: int | None, ts: int, prev_value: int | None, prev_ts: int) -> int | None:
+            # Timestamps are in µs; a counter reset reads as 0 rather than negative
+            if value is None or prev_value is None or ts <= prev_ts:
+                return None
+            return int(max(0, value - prev_value) / ((ts - prev_ts) / 1e6) / 1024)
+
+        return rate(current[0], current[1], prev[0], prev[1]), rate(current[2], current[3], prev[2], prev[3])
+
+    def _throttle_reasons(self, device: Any) -> int | None:
+        if not HAS_NVITOP:
+            return None
+        # Renamed from "throttle" to "clocks event" reasons in newer drivers
+        for fn in ("nvmlDeviceGetCurrentClocksEventReasons", "nvmlDeviceGetCurrentClocksThrottleReasons"):
+            value = query(lambda: libnvml.nvmlQuery(fn, device.handle))
+            if value is not None:
+                return value
+        return None
+
+    def burst(self, device: Any) -> GpuBurst | None:
+        """Min/mean/max of the driver's utilisation and power samples since the last call.
+
+        NVML buffers readings taken far more often than a UI polls, so folding
+        them per tick shows bursts a single point read aliases away. The first
+        call per device only records where the buffer ends and returns None.
+        """
+        if not HAS_NVITOP:
+            return None
+        util = self._buffered(device, "util", libnvml.NVML_GPU_UTILIZATION_SAMPLES)
+        power = self._buffered(device, "power", libnvml.NVML_TOTAL_POWER_SAMPLES)
+        if util is None and power is None:
+            return None
+        return GpuBurst(index=device.index, util=util, power=power)
+
+    def _buffered(self, device: Any, kind: str, sampling_type: int) -> SampleStats | None:
+        key = (device.index, kind)
+        last = self._sample_ts.get(key)
+        try:
+            # NOT_FOUND (nothing new) and unsupported devices both come back as N/A
+            result = libnvml.nvmlQuery("nvmlDeviceGetSamples", device.handle, sampling_type, last or 0)
+        except Exception:
+            return None
+        if not isinstance(result, tuple):
+            return None
+        value_type, samples = result
+        field = _SAMPLE_FIELDS.get(value_type)
+        if field is None or not samples:
+            return None
+        self._sample_ts[key] = max(s.timeStamp for s in samples)
+        if last is None:
+            return None
+        values = [getattr(s.sampleValue, field) for s in samples if s.timeStamp > last]
+        if not values:
+            return None
+        return SampleStats(count=len(values), min=min(values), mean=sum(values) / len(values), max=max(values))
+
+    def total_energy_mj(self, device: Any) -> int | None:
+        """Driver energy counter in mJ since it was loaded (Volta and newer), else None."""
+        if not HAS_NVITOP:
+            return None
+        return query(lambda: libnvml.nvmlQuery("nvmlDeviceGetTotalEnergyConsumption", device.handle))
+
+    def gpus(self) -> list[GpuSnapshot]:
+        return [self.gpu(device) for device in self.devices]
+
+    def processes(self, device: Any) -> list[tuple[Any, GpuProcessSnapshot]]:
+        """Return (nvitop process, snapshot) pairs for one device; [] if NVML fails."""
+        try:
+            raw = device.processes()
+        except Exception:
+            return []
+        procs = raw.values() if isinstance(raw, dict) else raw
+        return [
+            (p, GpuProcessSnapshot(
+                pid=p.pid,
+                device=device.index,
+                gpu_mem=process_gpu_memory(p),
+                sm=query(p.gpu_sm_utilization),
+            ))
+            for p in procs
+        ]
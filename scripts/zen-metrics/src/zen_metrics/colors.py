@@ -0,0 +1,81 @@
+"""Palette and gradient helpers shared by the statusline and zen-nv."""
+
+from __future__ import annotations
+
+# Tokyo Night inspired muted palette
+COLORS = {
+    "blue": "#7aa2f7",
+    "green": "#9ece6a",
+    "yellow": "#e0af68",
+    "red": "#f7768e",
+    "magenta": "#bb9af7",
+    "cyan": "#7dcfff",
+    "orange": "#ff9e64",
+    "gray": "#565f89",
+    "white": "#c0caf5",
+    "dim": "#3b4261",
+    "separator": "#545c7e",
+}
+
+
+def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
+    """Convert hex color to RGB tuple."""
+    hex_color = hex_color.lstrip("#")
+    return tuple(int(hex_color[i : i + 2], 16) for i in (0, 2, 4))  # type: ignore[return-value]
+
+
+def rgb_to_hex(r: int, g: int, b: int) -> str:
+    """Convert RGB tuple to hex color."""
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def lerp_color(color1: str, color2: str, t: float) -> str:
+    """Linearly interpolate between two hex colors."""
+    r1, g1, b1 = hex_to_rgb(color1)
+    r2, g2, b2 = hex_to_rgb(color2)
+    r = int(r1 + (r2 - r1) * t)
+    g = int(g1 + (g2 - g1) * t)
+    b = int(b1 + (b2 - b1) * t)
+    return rgb_to_hex(r, g, b)
+
+
+def gradient_color(pct: float, inverse: bool = False) -> str:
+    """
+    Get a gradient color based on percentage (0-100).
+
+    Colors transition: green -> yellow -> orange -> red
+    If inverse=True, low values are bad (e.g., for disk space).
+    """
+    if inverse:
+        pct = 100 - pct
+
+    pct = max(0, min(100, pct))
+
+    # Define color stops
+    green = COLORS["green"]
+    yellow = COLORS["yellow"]
+    orange = COLORS["orange"]
+    red = COLORS["red"]
+
+    if pct <= 25:
+        # Green zone - pure green
+        return green
+    elif pct <= 50:
+        # Green to yellow transition
+        t = (pct - 25) / 25
+        return lerp_color(green, yellow, t)
+    elif pct <= 75:
+        # Yellow to orange transition
+        t = (pct - 50) / 25
+        return lerp_color(yellow, orange, t)
+    else:
+        # Orange to red transition
+        t = (pct - 75) / 25
+        return lerp_color(orange, red, t)
+
+
+def temp_gradient_color(temp_c: float) -> str:
+    """Get gradient color for temperature (Celsius)."""
+    # Map temperature to percentage: 30°C = 0%, 90°C = 100%
+    pct = ((temp_c - 30) / 60) * 100
+    return gradient_color(pct)
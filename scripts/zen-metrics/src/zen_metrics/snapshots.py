@@ -0,0 +1,148 @@
+"""Typed, slotted sample records produced by the collector."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class HostSnapshot:
+    """One CPU/RAM sample."""
+
+    cpu_percent: float
+    ram_percent: float
+    ram_used: int
+    ram_total: int
+
+
+@dataclass(slots=True)
+class GpuStatic:
+    """Device properties that do not change while the driver is loaded."""
+
+    index: int
+    name: str
+    mem_total: int | None
+    power_limit_mw: int | None
+    bus_id: str | None
+
+
+@dataclass(slots=True)
+class GpuSnapshot:
+    """One batched read of a device's dynamic state. Unsupported fields are None."""
+
+    static: GpuStatic
+    util: int | None
+    mem_used: int | None
+    temp_c: int | None
+    fan: int | None
+    power_mw: int | None
+
+    @property
+    def index(self) -> int:
+        return self.static.index
+
+    @property
+    def name(self) -> str:
+        return self.static.name
+
+    @property
+    def mem_total(self) -> int | None:
+        return self.static.mem_total
+
+    @property
+    def mem_percent(self) -> float:
+        total = self.static.mem_total
+        return (self.mem_used / total) * 100 if self.mem_used is not None and total else 0.0
+
+    @property
+    def power_w(self) -> float | None:
+        return self.power_mw / 1000 if self.power_mw is not None else None
+
+    @property
+    def power_limit_w(self) -> float | None:
+        limit = self.static.power_limit_mw
+        return limit / 1000 if limit is not None else None
+
+    @property
+    def power_percent(self) -> float | None:
+        limit = self.static.power_limit_mw
+        return (self.power_mw / limit) * 100 if self.power_mw is not None and limit else None
+
+
+@dataclass(slots=True)
+class GpuProcessSnapshot:
+    """A process holding memory on one device."""
+
+    pid: int
+    device: int
+    gpu_mem: int | None
+    sm: int | None
+
+
+@dataclass(slots=True)
+class SampleStats:
+    """Min/mean/max over the driver's buffered samples for one tick."""
+
+    count: int
+    min: float
+    mean: float
+    max: float
+
+
+@dataclass(slots=True)
+class GpuBurst:
+    """Buffered utilisation (%) and power (mW) samples folded since the previous read."""
+
+    index: int
+    util: SampleStats | None
+    power: SampleStats | None
+
+
+# NVML clocks-event (throttle) reason bits
+THROTTLE_REASONS = {
+    0x1: "idle",
+    0x2: "app clocks",
+    0x4: "power cap",
+    0x8: "hw slowdown",
+    0x10: "sync boost",
+    0x20: "sw thermal",
+    0x40: "hw thermal",
+    0x80: "power brake",
+    0x100: "display clocks",
+}
+
+
+@dataclass(slots=True)
+class GpuDiagnostics:
+    """Throughput and clock detail explaining why a device is slow. Throughputs in KiB/s."""
+
+    index: int
+    pcie_tx: int | None
+    pcie_rx: int | None
+    nvlink_tx: int | None
+    nvlink_rx: int | None
+    sm_clock: int | None
+    mem_clock: int | None
+    max_sm_clock: int | None
+    max_mem_clock: int | None
+    throttle: int | None
+
+    @property
+    def sm_clock_percent(self) -> float | None:
+        if self.sm_clock is None or not self.max_sm_clock:
+            return None
+        return self.sm_clock / self.max_sm_clock * 100
+
+    @property
+    def mem_clock_percent(self) -> float | None:
+        if self.mem_clock is None or not self.max_mem_clock:
+            return None
+        return self.mem_clock / self.max_mem_clock * 100
+
+    @property
+    def throttle_reasons(self) -> list[str]:
+        """Active reasons, ignoring "idle" which only means no work is queued."""
+        if not self.throttle:
+            return []
+        return [name for bit, name in THROTTLE_REASONS.items() if self.throttle & bit and bit != 0x1]
+
@@ -0,0 +1,242 @@
+import operator
+import os
+import re
+import subprocess
+import time
+from collections import deque
+
+# Per-GPU metrics a rule can reference (units as sampled by StatsWidget)
+METRICS = {
+    "util": "GPU utilisation %",
+    "vram": "VRAM used %",
+    "temp": "temperature °C",
+    "power": "power draw as % of limit",
+    "procs": "processes holding memory",
+}
+
+OPS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+DEFAULT_RULES = [
+    "vram > 95 for 30s",
+    "idle: util < 10 and procs > 0 for 5m",
+    "temp > 85",
+    "power >= 98 for 10s",
+]
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)(ms|s|m|h)?$")
+_TERM = re.compile(
+    r"^(?:(avg|min|max)\(\s*(\w+)\s*,\s*([\w.]+)\s*\)|(\w+))\s*(>=|<=|==|!=|>|<)\s*(-?\d+(?:\.\d+)?)$"
+)
+
+
+def parse_duration(text):
+    m = _DURATION.match(text.strip())
+    if not m:
+        raise ValueError(f"bad duration: {text!r}")
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}[m.group(2)]
+    return float(m.group(1)) * scale
+
+
+# --- Sliding Window Aggregates ---
+class WindowAgg:
+    """Time-windowed avg/min/max with amortised O(1) updates.
+
+    avg keeps a running sum; min/max keep a monotonic deque so the extreme is
+    always at the front. Each sample is pushed and popped at most once.
+    """
+
+    __slots__ = ("kind", "window", "samples", "total")
+
+    def __init__(self, kind, window):
+        self.kind = kind
+        self.window = window
+        self.samples = deque()  # (t, value)
+        self.total = 0.0
+
+    def push(self, t, value):
+        samples = self.samples
+        if self.kind == "avg":
+            samples.append((t, value))
+            self.total += value
+        else:
+            worse = operator.ge if self.kind == "min" else operator.le
+            while samples and worse(samples[-1][1], value):
+                samples.pop()
+            samples.append((t, value))
+
+        cutoff = t - self.window
+        while samples and samples[0][0] < cutoff:
+            _, old = samples.popleft()
+            if self.kind == "avg":
+                self.total -= old
+
+        if self.kind == "avg":
+            return self.total / len(samples)
+        return samples[0][1]
+
+
+class Term:
+    __slots__ = ("metric", "agg", "window", "op", "threshold")
+
+    def __init__(self, metric, op, threshold, agg=None, window=None):
+        if metric not in METRICS:
+            raise ValueError(f"unknown metric {metric!r} (expected one of {', '.join(METRICS)})")
+        self.metric = metric
+        self.op = op
+        self.threshold = threshold
+        self.agg = agg
+        self.window = window
+
+
+class Rule:
+    """`[name:] term [and term ...] [for duration]`, e.g. `vram > 95 for 30s`."""
+
+    def __init__(self, text):
+        self.text = text.strip()
+        name, sep, body = self.text.partition(":")
+        if sep and " " not in name.strip() and "(" not in name:
+            self.name, body = name.strip(), body.strip()
+        else:
+            self.name, body = self.text, self.text
+
+        self.duration = 0.0
+        m = re.search(r"\s+for\s+(\S+)$", body)
+        if m:
+            self.duration = parse_duration(m.group(1))
+            body = body[: m.start()]
+
+        self.terms = []
+        for part in re.split(r"\s+and\s+", body.strip()):
+            t = _TERM.match(part.strip())
+            if not t:
+                raise ValueError(f"cannot parse alert condition {part!r} in {text!r}")
+            agg, agg_metric, window, metric, op, value = t.groups()
+            if agg:
+                self.terms.append(Term(agg_metric, OPS[op], float(value), agg, parse_duration(window)))
+            else:
+                self.terms.append(Term(metric, OPS[op], float(value)))
+
+
+class _RuleState:
+    __slots__ = ("aggs", "true_since", "firing", "value")
+
+    def __init__(self, rule):
+        self.aggs = [WindowAgg(term.agg, term.window) if term.agg else None for term in rule.terms]
+        self.true_since = None
+        self.firing = False
+        self.value = None
+
+
+class AlertEvent:
+    __slots__ = ("rule", "device", "firing", "value", "time")
+
+    def __init__(self, rule, device, firing, value, t):
+        self.rule = rule
+        self.device = device
+        self.firing = firing
+        self.value = value
+        self.time = t
+
+    def describe(self):
+        state = "FIRING" if self.firing else "resolved"
+        return f"GPU {self.device}: {self.rule.name} {state} (value {self.value:g})"
+
+
+# --- Alert Engine ---
+class AlertEngine:
+    """Evaluates every rule against each new per-GPU sample.
+
+    Rule "for" durations are tracked as a true-since timestamp and windowed
+    aggregates as `WindowAgg`s, so evaluation never rescans history.
+    Transitions are delivered to listeners, the optional log file and the
+    optional hook command.
+    """
+
+    def __init__(self, rules=(), log_path=None, hook=None):
+        self.rules = [r if isinstance(r, Rule) else Rule(r) for r in rules]
+        self.log_path = log_path
+        self.hook = hook
+        self.listeners = []
+        self.hooks = []  # running hook processes, reaped on later dispatches
+        self.latest = {}  # device -> {metric: value}
+        self.states = {}  # device -> [_RuleState per rule]
+
+    def update(self, device, **metrics):
+        # NVML reports unsupported fields as N/A strings; those count as missing
+        latest = self.latest.setdefault(device, {})
+        for name, value in metrics.items():
+            latest[name] = value if isinstance(value, (int, float)) else None
+
+    def evaluate(self, device, t=None):
+        t = time.monotonic() if t is None else t
+        values = self.latest.get(device, {})
+        states = self.states.get(device)
+        if states is None:
+            states = self.states[device] = [_RuleState(rule) for rule in self.rules]
+
+        for rule, state in zip(self.rules, states):
+            ok = True
+            for term, agg in zip(rule.terms, state.aggs):
+                value = values.get(term.metric)
+                if value is None:
+                    ok = False
+                    continue
+                if agg is not None:
+                    value = agg.push(t, value)
+                if ok and not term.op(value, term.threshold):
+                    ok = False
+                if term is rule.terms[0]:
+                    state.value = value
+
+            if ok:
+                if state.true_since is None:
+                    state.true_since = t
+                firing = t - state.true_since >= rule.duration
+            else:
+                state.true_since = None
+                firing = False
+
+            if firing != state.firing:
+                state.firing = firing
+                self._dispatch(AlertEvent(rule, device, firing, state.value or 0, t))
+
+    def firing(self, device):
+        states = self.states.get(device, ())
+        return [rule for rule, state in zip(self.rules, states) if state.firing]
+
+    def forget(self, device):
+        self.latest.pop(device, None)
+        self.states.pop(device, None)
+
+    def _dispatch(self, event):
+        for listener in self.listeners:
+            listener(event)
+        if self.log_path:
+            try:
+                with open(self.log_path, "a") as f:
+                    f.write(f"{time.strftime('%Y-%m-%dT%H:%M:%S')} {event.describe()}\n")
+            except OSError:
+                pass
+        if self.hook and event.firing:
+            env = dict(
+                os.environ,
+                ZEN_NV_ALERT=event.rule.name,
+                ZEN_NV_GPU=str(event.device),
+                ZEN_NV_VALUE=f"{event.value:g}",
+            )
+            self.hooks = [p for p in self.hooks if p.poll() is None]
+            try:
+                # Fire and forget; a slow hook must not stall the refresh loop
+                self.hooks.append(subprocess.Popen(
+                    self.hook, shell=True, env=env,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                ))
+            except OSError:
+                pass
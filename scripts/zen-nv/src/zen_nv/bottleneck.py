@@ -0,0 +1,145 @@
+import math
+import time
+
+import psutil
+
+from zen_nv.proctree import ProcessTree
+
+GPU_BOUND = "GPU-bound"
+INPUT_BOUND = "input-bound"
+IO_BOUND = "I/O-bound"
+IDLE = "idle"
+MIXED = "mixed"
+
+
+# --- Streaming Statistics ---
+class EwStats:
+    """Exponentially weighted means, variances and SM/CPU covariance.
+
+    alpha = 2 / (window + 1) gives roughly the same memory as a `window`-sample
+    moving average, but each update is O(1) and no samples are stored.
+    """
+
+    __slots__ = ("alpha", "n", "sm", "cpu", "io", "threads", "var_sm", "var_cpu", "cov")
+
+    def __init__(self, window):
+        self.alpha = 2.0 / (window + 1)
+        self.n = 0
+        self.sm = self.cpu = self.io = self.threads = 0.0
+        self.var_sm = self.var_cpu = self.cov = 0.0
+
+    def push(self, sm, cpu, io, threads):
+        self.n += 1
+        if self.n == 1:
+            self.sm, self.cpu, self.io, self.threads = sm, cpu, io, threads
+            return
+        a = self.alpha
+        d_sm = sm - self.sm
+        d_cpu = cpu - self.cpu
+        self.sm += a * d_sm
+        self.cpu += a * d_cpu
+        self.io += a * (io - self.io)
+        self.threads += a * (threads - self.threads)
+        # West's incremental update for weighted (co)variance
+        self.var_sm = (1 - a) * (self.var_sm + a * d_sm * d_sm)
+        self.var_cpu = (1 - a) * (self.var_cpu + a * d_cpu * d_cpu)
+        self.cov = (1 - a) * (self.cov + a * d_sm * d_cpu)
+
+    @property
+    def correlation(self):
+        denom = math.sqrt(self.var_sm * self.var_cpu)
+        return self.cov / denom if denom > 1e-9 else 0.0
+
+
+# --- Classification ---
+class Verdict:
+    __slots__ = ("label", "cpu", "saturation", "io", "threads", "correlation")
+
+    def __init__(self, label, stats, saturation):
+        self.label = label
+        self.cpu = stats.cpu
+        self.saturation = saturation
+        self.io = stats.io
+        self.threads = stats.threads
+        self.correlation = stats.correlation
+
+    def describe(self):
+        return (f"{self.label}: tree CPU {self.cpu:.0f}% ({self.saturation:.0%} of workers), "
+                f"iowait {self.io:.0f}%, {self.threads:.0f} threads, SM~CPU r={self.correlation:+.2f}")
+
+
+class BottleneckAnalyzer:
+    """Classifies each GPU process as GPU-, input- or I/O-bound.
+
+    Every scan samples the process tree (the GPU process plus its dataloader
+    workers, see `ProcessTree`) for CPU %, iowait % and threads, and pushes
+    them with the process's SM utilisation into per-(pid, device) `EwStats`.
+    Child lists are re-read every `relist_s` seconds.
+
+    - GPU-bound: SM utilisation stays high.
+    - I/O-bound: SM is low and the tree spends a large share of time in iowait.
+    - input-bound: SM is low while the tree's workers are CPU-saturated (or SM
+      dips track CPU spikes), i.e. the GPU is waiting on preprocessing.
+    - idle / mixed: nothing running, or no single resource stands out.
+    """
+
+    def __init__(self, window=30, min_samples=8, relist_s=10.0,
+                 gpu_busy=70.0, io_wait=15.0, cpu_saturated=0.8):
+        self.window = window
+        self.min_samples = min_samples
+        self.relist_s = relist_s
+        self.gpu_busy = gpu_busy
+        self.io_wait = io_wait
+        self.cpu_saturated = cpu_saturated
+        self.n_cpus = psutil.cpu_count() or 1
+        self.trees = {}  # pid -> ProcessTree
+        self.stats = {}  # (pid, device) -> EwStats
+        self.scan = {}  # pid -> TreeSample for the current scan
+
+    def begin_scan(self):
+        self.scan = {}
+
+    def _sample_tree(self, pid, now):
+        tree = self.trees.get(pid)
+        if tree is None:
+            tree = self.trees[pid] = ProcessTree(pid, self.relist_s)
+        sample = tree.sample(now)
+        return sample if sample is not None and sample.cpu is not None else None
+
+    def update(self, pid, device, sm, now=None):
+        now = time.monotonic() if now is None else now
+        if pid not in self.scan:
+            self.scan[pid] = self._sample_tree(pid, now)
+        sample = self.scan[pid]
+        if sample is None:
+            return
+        stats = self.stats.get((pid, device))
+        if stats is None:
+            stats = self.stats[(pid, device)] = EwStats(self.window)
+        stats.push(sm or 0, sample.cpu, sample.io, sample.threads)
+
+    def verdict(self, pid, device):
+        stats = self.stats.get((pid, device))
+        sample = self.scan.get(pid)
+        if stats is None or stats.n < self.min_samples or sample is None:
+            return None
+        workers = min(sample.procs, self.n_cpus)
+        saturation = min(1.0, stats.cpu / (100 * workers))
+        if stats.sm >= self.gpu_busy:
+            label = GPU_BOUND
+        elif stats.io >= self.io_wait:
+            label = IO_BOUND
+        elif saturation >= self.cpu_saturated or (stats.correlation <= -0.5 and saturation >= 0.5):
+            label = INPUT_BOUND
+        elif stats.sm < 5 and saturation < 0.1:
+            label = IDLE
+        else:
+            label = MIXED
+        return Verdict(label, stats, saturation)
+
+    def evict(self, live_keys):
+        for key in self.stats.keys() - live_keys:
+            del self.stats[key]
+        live_pids = {pid for pid, _ in live_keys}
+        for pid in self.trees.keys() - live_pids:
+            del self.trees[pid]
@@ -0,0 +1,158 @@
+import os
+import time
+from collections import OrderedDict
+
+JOULES_PER_KWH = 3.6e6
+
+
+# --- Energy Accounting ---
+def session_job(pid):
+    # Processes launched together (torchrun, a shell pipeline) share a session
+    try:
+        return f"sid:{os.getsid(pid)}"
+    except OSError:
+        return f"pid:{pid}"
+
+
+def format_energy(joules):
+    if joules >= 0.1 * JOULES_PER_KWH:
+        return f"{joules / JOULES_PER_KWH:.2f} kWh"
+    if joules >= 1000:
+        return f"{joules / 1000:.1f} kJ"
+    return f"{joules:.0f} J"
+
+
+class Account:
+    # Integrated energy and utilisation-time for one GPU, process or job
+    __slots__ = ("joules", "util_s", "seconds")
+
+    def __init__(self):
+        self.joules = 0.0
+        self.util_s = 0.0
+        self.seconds = 0.0
+
+    @property
+    def kwh(self):
+        return self.joules / JOULES_PER_KWH
+
+    @property
+    def perf_per_watt(self):
+        # Mean utilisation per mean watt (%/W); higher is more efficient
+        return self.util_s / self.joules if self.joules else 0.0
+
+    def as_dict(self):
+        return {
+            "joules": round(self.joules, 1),
+            "kwh": round(self.kwh, 6),
+            "seconds": round(self.seconds, 1),
+            "avg_watts": round(self.joules / self.seconds, 1) if self.seconds else 0.0,
+            "util_per_watt": round(self.perf_per_watt, 4),
+        }
+
+
+class EnergyMeter:
+    """Trapezoidal power integration per GPU, attributed to processes and jobs.
+
+    Each GPU sample adds (P_prev + P_now) / 2 * dt to the device. That energy
+    is split across the device's processes in proportion to their latest SM
+    utilisation; with no SM activity it is booked as the device's idle energy.
+    Gaps longer than `max_gap` (suspend, stalled ticks) are not integrated.
+    """
+
+    def __init__(self, max_gap=30.0, max_jobs=256, job_of=session_job):
+        self.max_gap = max_gap
+        self.max_jobs = max_jobs
+        self.job_of = job_of
+        self.last = {}  # device -> (t, watts)
+        self.devices = {}  # device -> Account
+        self.idle = {}  # device -> joules with no SM activity
+        self.shares = {}  # device -> {pid: sm}
+        self.procs = {}  # (pid, device) -> Account
+        self.jobs = OrderedDict()  # job -> Account, least recently active first
+        self.pid_jobs = {}  # pid -> job
+
+    def add_sample(self, device, watts, util=None, t=None):
+        t = time.monotonic() if t is None else t
+        if watts is None:
+            return 0.0
+        prev = self.last.get(device)
+        self.last[device] = (t, watts)
+        if prev is None:
+            return 0.0
+        dt = t - prev[0]
+        if dt <= 0 or dt > self.max_gap:
+            return 0.0
+
+        joules = (prev[1] + watts) / 2 * dt
+        acct = self.devices.get(device)
+        if acct is None:
+            acct = self.devices[device] = Account()
+        acct.joules += joules
+        acct.util_s += (util or 0) * dt
+        acct.seconds += dt
+
+        shares = self.shares.get(device)
+        total = sum(shares.values()) if shares else 0
+        if not total:
+            self.idle[device] = self.idle.get(device, 0.0) + joules
+            return joules
+        for pid, sm in shares.items():
+            if not sm:
+                continue
+            part = joules * sm / total
+            for acct in (self._proc(pid, device), self._job(pid)):
+                acct.joules += part
+                acct.util_s += sm * dt
+                acct.seconds += dt
+        return joules
+
+    def set_shares(self, device, shares):
+        # Latest SM utilisation per pid on a device, from the GPU process scan
+        self.shares[device] = shares
+
+    def _proc(self, pid, device):
+        acct = self.procs.get((pid, device))
+        if acct is None:
+            acct = self.procs[(pid, device)] = Account()
+        return acct
+
+    def _job(self, pid):
+        job = self.pid_jobs.get(pid)
+        if job is None:
+            job = self.pid_jobs[pid] = self.job_of(pid)
+        acct = self.jobs.get(job)
+        if acct is None:
+            acct = self.jobs[job] = Account()
+            while len(self.jobs) > self.max_jobs:
+                self.jobs.popitem(last=False)
+        else:
+            self.jobs.move_to_end(job)
+        return acct
+
+    def evict(self, live_keys):
+        # Per-process accounts end with the process; job totals outlive their pids
+        for key in self.procs.keys() - live_keys:
+            del self.procs[key]
+        live_pids = {pid for pid, _ in live_keys}
+        for pid in self.pid_jobs.keys() - live_pids:
+            del self.pid_jobs[pid]
+
+    def process(self, pid, device):
+        return self.procs.get((pid, device))
+
+    def job(self, pid):
+        job = self.pid_jobs.get(pid)
+        return job, self.jobs.get(job)
+
+    def device(self, device):
+        return self.devices.get(device)
+
+    def summary(self):
+        return {
+            "gpus": {
+                str(dev): dict(acct.as_dict(), idle_joules=round(self.idle.get(dev, 0.0), 1))
+                for dev, acct in sorted(self.devices.items())
+            },
+            "processes": {f"{pid}@{dev}": acct.as_dict() for (pid, dev), acct in self.procs.items()},
+            "jobs": {job: acct.as_dict() for job, acct in self.jobs.items()},
+        }
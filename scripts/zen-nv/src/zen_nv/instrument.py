@@ -0,0 +1,113 @@
+import json
+import os
+import time
+from collections import deque
+
+import psutil
+
+CATEGORIES = ("nvml", "psutil", "graphs", "tables")
+
+
+# --- Self Instrumentation ---
+class _Section:
+    # Plain __enter__/__exit__ instead of @contextmanager: no generator per call
+    __slots__ = ("owner", "name", "t0")
+
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+
+    def __exit__(self, *exc):
+        self.owner.current[self.name] += time.perf_counter_ns() - self.t0
+        return False
+
+
+class Instrumentation:
+    """Per-tick time split of zen-nv's own work plus process CPU/RSS.
+
+    Sections accumulate nanoseconds into the current tick; `end_tick` pushes
+    the tick onto a bounded window. A tick that starts much later than
+    expected counts the intervals it skipped as missed.
+    """
+
+    def __init__(self, window=120):
+        self.window = window
+        self.ticks = deque(maxlen=window)
+        self.current = dict.fromkeys(CATEGORIES, 0)
+        self.sections = {name: _Section(self, name) for name in CATEGORIES}
+        self.tick_start = None
+        self.last_tick = None
+        self.expected = None
+        self.missed = 0
+        self.total_ticks = 0
+
+        self.proc = psutil.Process()
+        self.proc.cpu_percent()  # prime the delta
+        self.cpu_pct = 0.0
+        self.rss = self.proc.memory_info().rss
+        self.last_usage = time.monotonic()
+
+    def section(self, name):
+        return self.sections[name]
+
+    def begin_tick(self, expected_interval):
+        now = time.monotonic()
+        if self.last_tick is not None and expected_interval:
+            late = (now - self.last_tick) / expected_interval
+            if late >= 2:
+                self.missed += int(late) - 1
+        self.last_tick = now
+        self.expected = expected_interval
+        self.tick_start = time.perf_counter_ns()
+        for name in CATEGORIES:
+            self.current[name] = 0
+
+    def end_tick(self, record=True):
+        # Base ticks where no source was due are not recorded; they would dilute the averages
+        if self.tick_start is None:
+            return
+        if record:
+            sample = dict(self.current)
+            sample["total"] = time.perf_counter_ns() - self.tick_start
+            self.ticks.append(sample)
+            self.total_ticks += 1
+        self.tick_start = None
+
+        # Own CPU%/RSS costs a couple of syscalls; sample it at most once a second
+        now = time.monotonic()
+        if now - self.last_usage >= 1.0:
+            self.cpu_pct = self.proc.cpu_percent()
+            self.rss = self.proc.memory_info().rss
+            self.last_usage = now
+
+    def summary(self):
+        stats = {}
+        for name in CATEGORIES + ("total",):
+            vals = [t[name] for t in self.ticks]
+            stats[name] = {
+                "avg_ms": round(sum(vals) / len(vals) / 1e6, 3) if vals else 0.0,
+                "max_ms": round(max(vals) / 1e6, 3) if vals else 0.0,
+            }
+        return {
+            "pid": os.getpid(),
+            "ticks": self.total_ticks,
+            "window": len(self.ticks),
+            "missed_ticks": self.missed,
+            "cpu_percent": self.cpu_pct,
+            "rss_bytes": self.rss,
+            "sections": stats,
+        }
+
+    def dump(self, path, extra=None):
+        data = self.summary()
+        if extra:
+            data.update(extra)
+        text = json.dumps(data, indent=2)
+        if path == "-":
+            print(text)
+        else:
+            with open(path, "w") as f:
+                f.write(text + "\n")
@@ -0,0 +1,169 @@
+import os
+import re
+import time
+
+import psutil
+
+PRESSURE_ROOT = "/proc/pressure"
+SYS_BLOCK = "/sys/block"
+SYS_NET = "/sys/class/net"
+PSI_RESOURCES = ("cpu", "memory", "io")
+
+# Whole-disk names; partitions are skipped when their parent disk is listed
+_PARTITION = re.compile(r"^(?P<disk>(?:nvme\d+n\d+|mmcblk\d+))p\d+$|^(?P<sd>[shv]d[a-z]+|xvd[a-z]+)\d+$")
+_VIRTUAL_DISK = ("loop", "ram", "zram", "sr")
+# device-mapper (LVM, dm-crypt) and md RAID re-count the I/O of the disks beneath them
+_STACKED_DISK = ("dm-", "md")
+# Bridges only forward traffic that already crossed a physical NIC or a container veth
+_VIRTUAL_NIC = ("lo", "ifb", "veth", "docker", "virbr", "br-")
+
+
+# --- Pressure Stall Information ---
+def parse_pressure(text):
+    # "some avg10=0.00 avg60=0.00 avg300=0.00 total=1401085" -> {"some": 1401085, ...}
+    totals = {}
+    for line in text.splitlines():
+        kind, _, rest = line.partition(" ")
+        for field in rest.split():
+            if field.startswith("total="):
+                totals[kind] = int(field[6:])
+    return totals
+
+
+def _stacked_disk(name, sys_block=SYS_BLOCK):
+    if name.startswith(_STACKED_DISK):
+        return True
+    try:
+        # Any other block device built on top of others (bcache, ...) lists them as slaves
+        return bool(os.listdir(os.path.join(sys_block, name, "slaves")))
+    except OSError:
+        return False
+
+
+def _enslaved_nic(name, sys_net=SYS_NET):
+    # Bond and bridge members carry traffic the master already counts
+    return os.path.exists(os.path.join(sys_net, name, "master"))
+
+
+def _physical_disks(names, stacked=_stacked_disk):
+    disks = []
+    for name in names:
+        if name.startswith(_VIRTUAL_DISK) or stacked(name):
+            continue
+        m = _PARTITION.match(name)
+        if m and (m.group("disk") or m.group("sd")) in names:
+            continue
+        disks.append(name)
+    return disks
+
+
+class IoSample:
+    __slots__ = ("psi", "disks", "nics", "disk_read", "disk_write", "net_rx", "net_tx")
+
+    def __init__(self):
+        self.psi = {}  # resource -> {"some": %, "full": %}
+        self.disks = []  # (name, read B/s, write B/s), busiest first
+        self.nics = []  # (name, rx B/s, tx B/s), busiest first
+        self.disk_read = self.disk_write = 0.0
+        self.net_rx = self.net_tx = 0.0
+
+
+class IoSampler:
+    """PSI stall %, per-disk and per-NIC throughput as deltas between samples.
+
+    Each sample is three small /proc/pressure reads plus one read each of
+    /proc/diskstats and /proc/net/dev (via psutil). Stall % is the growth of
+    PSI's cumulative stall microseconds over the sample interval, so it
+    reacts faster than the kernel's avg10. Stacked disks (LVM, RAID,
+    dm-crypt) and bridge/bond members are skipped so no byte counts twice;
+    the sysfs lookups behind that are cached per device name.
+    """
+
+    def __init__(self, pressure_root=PRESSURE_ROOT):
+        self.pressure_paths = {
+            r: os.path.join(pressure_root, r) for r in PSI_RESOURCES
+            if os.path.exists(os.path.join(pressure_root, r))
+        }
+        self.last_t = None
+        self.last_psi = {}
+        self.last_disk = {}
+        self.last_net = {}
+        self.stacked = {}  # disk name -> stacked on other disks
+        self.enslaved = {}  # NIC name -> member of a bond or bridge
+        self.sample()  # prime the deltas
+
+    @property
+    def has_psi(self):
+        return bool(self.pressure_paths)
+
+    def _read_psi(self):
+        totals = {}
+        for resource, path in self.pressure_paths.items():
+            try:
+                with open(path) as f:
+                    totals[resource] = parse_pressure(f.read())
+            except OSError:
+                pass
+        return totals
+
+    def _is_stacked(self, name):
+        stacked = self.stacked.get(name)
+        if stacked is None:
+            stacked = self.stacked[name] = _stacked_disk(name)
+        return stacked
+
+    def _is_enslaved(self, name):
+        enslaved = self.enslaved.get(name)
+        if enslaved is None:
+            enslaved = self.enslaved[name] = _enslaved_nic(name)
+        return enslaved
+
+    def sample(self):
+        now = time.monotonic()
+        psi = self._read_psi()
+        try:
+            disk = psutil.disk_io_counters(perdisk=True) or {}
+        except (OSError, RuntimeError):
+            disk = {}
+        try:
+            net = psutil.net_io_counters(pernic=True) or {}
+        except OSError:
+            net = {}
+
+        out = IoSample()
+        dt = now - self.last_t if self.last_t is not None else 0
+        if dt > 0:
+            for resource, totals in psi.items():
+                prev = self.last_psi.get(resource, {})
+                out.psi[resource] = {
+                    kind: min(100.0, max(0.0, (total - prev[kind]) / (dt * 1e6) * 100))
+                    for kind, total in totals.items() if kind in prev
+                }
+            for name in _physical_disks(disk, self._is_stacked):
+                prev = self.last_disk.get(name)
+                if prev is None:
+                    continue
+                c = disk[name]
+                # Counters can reset (device re-plugged); clamp instead of reporting negative rates
+                read = max(0, c.read_bytes - prev.read_bytes) / dt
+                write = max(0, c.write_bytes - prev.write_bytes) / dt
+                out.disks.append((name, read, write))
+                out.disk_read += read
+                out.disk_write += write
+            for name, c in net.items():
+                prev = self.last_net.get(name)
+                if prev is None or name.startswith(_VIRTUAL_NIC) or self._is_enslaved(name):
+                    continue
+                rx = max(0, c.bytes_recv - prev.bytes_recv) / dt
+                tx = max(0, c.bytes_sent - prev.bytes_sent) / dt
+                out.nics.append((name, rx, tx))
+                out.net_rx += rx
+                out.net_tx += tx
+            out.disks.sort(key=lambda d: d[1] + d[2], reverse=True)
+            out.nics.sort(key=lambda n: n[1] + n[2], reverse=True)
+
+        self.last_t = now
+        self.last_psi = psi
+        self.last_disk = disk
+        self.last_net = net
+        return out
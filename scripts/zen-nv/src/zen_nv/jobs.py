@@ -0,0 +1,173 @@
+import re
+
+import psutil
+
+from zen_nv.energy import session_job
+
+# Checked in order against each cgroup path; the first match names the job
+JOB_PATTERNS = [
+    ("slurm", re.compile(r"/job_(\d+)")),
+    ("k8s", re.compile(r"pod([0-9a-f]{8}[-_][0-9a-f_-]+)")),
+    ("docker", re.compile(r"docker[-/]([0-9a-f]{12})")),
+    ("podman", re.compile(r"libpod-([0-9a-f]{12})")),
+    ("lxc", re.compile(r"lxc(?:\.payload\.|/)([^/]+)")),
+]
+
+# cgroup v2 first, then the v1 controllers most likely to carry a job hierarchy
+CONTROLLER_PRIORITY = ("", "memory", "cpu,cpuacct", "cpuacct", "cpu", "pids")
+
+
+# --- Job Resolution ---
+def parse_cgroup(text):
+    # /proc/<pid>/cgroup lines are "id:controllers:path"; returns non-root paths, best first
+    paths = {}
+    for line in text.splitlines():
+        parts = line.split(":", 2)
+        if len(parts) == 3 and parts[2] not in ("", "/"):
+            paths.setdefault(parts[1], parts[2])
+    ranked = [paths.pop(c) for c in CONTROLLER_PRIORITY if c in paths]
+    return ranked + list(paths.values())
+
+
+def job_from_cgroup(paths):
+    for kind, pattern in JOB_PATTERNS:
+        for path in paths:
+            m = pattern.search(path)
+            if m:
+                return f"{kind}:{m.group(1)}"
+    if paths:
+        # Plain systemd unit or session scope, e.g. "sshd.service", "session-3.scope"
+        return f"cg:{paths[0].rstrip('/').rsplit('/', 1)[-1]}"
+    return None
+
+
+class JobResolver:
+    """Maps a pid to its job label, reading /proc/<pid>/cgroup once per process.
+
+    Entries are keyed by (pid, create_time) so a recycled pid is resolved
+    afresh. Without cgroup information (macOS, unprivileged reads, the root
+    cgroup) processes fall back to grouping by session id.
+    """
+
+    def __init__(self, proc_root="/proc"):
+        self.proc_root = proc_root
+        self.cache = {}  # (pid, create_time) -> job
+        self.create_times = {}  # pid -> create_time of the live process
+
+    def resolve(self, pid, create_time=None):
+        if create_time is None:
+            create_time = self.create_times.get(pid)
+            if create_time is None:
+                try:
+                    create_time = psutil.Process(pid).create_time()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    create_time = 0.0
+        old = self.create_times.get(pid)
+        if old is not None and old != create_time:
+            # pid reused: the previous process's entry would otherwise never be evicted
+            self.cache.pop((pid, old), None)
+        self.create_times[pid] = create_time
+
+        key = (pid, create_time)
+        job = self.cache.get(key)
+        if job is None:
+            job = self.cache[key] = self._read(pid)
+        return job
+
+    def _read(self, pid):
+        try:
+            with open(f"{self.proc_root}/{pid}/cgroup") as f:
+                job = job_from_cgroup(parse_cgroup(f.read()))
+        except OSError:
+            job = None
+        return job or session_job(pid)
+
+    def evict(self, live_pids):
+        for pid in self.create_times.keys() - live_pids:
+            self.cache.pop((pid, self.create_times.pop(pid)), None)
+
+
+# --- Per-Job Aggregation ---
+class JobTotals:
+    __slots__ = ("procs", "cpu", "rss", "gpu_procs", "gpu_mem", "sm")
+
+    def __init__(self):
+        self.procs = 0
+        self.cpu = 0.0
+        self.rss = 0
+        self.gpu_procs = 0
+        self.gpu_mem = 0
+        self.sm = 0
+
+    def empty(self):
+        return not self.procs and not self.gpu_procs
+
+
+class JobAggregator:
+    """Per-job CPU%, RSS, GPU memory and SM% kept up to date from the process scans.
+
+    Each process's last contribution is remembered, so an update only applies
+    the difference to its job and an exit subtracts it; totals are never
+    recomputed from scratch.
+    """
+
+    def __init__(self):
+        self.totals = {}  # job -> JobTotals
+        self.cpu = {}  # pid -> (job, cpu, rss)
+        self.gpu = {}  # (pid, device) -> (job, gpu_mem, sm)
+
+    def _totals(self, job):
+        totals = self.totals.get(job)
+        if totals is None:
+            totals = self.totals[job] = JobTotals()
+        return totals
+
+    def _drop_if_empty(self, job):
+        if self.totals[job].empty():
+            del self.totals[job]
+
+    def update_cpu(self, pid, job, cpu, rss):
+        old = self.cpu.get(pid)
+        if old is not None:
+            self._remove_cpu(pid, old)
+        totals = self._totals(job)
+        totals.procs += 1
+        totals.cpu += cpu
+        totals.rss += rss
+        self.cpu[pid] = (job, cpu, rss)
+
+    def update_gpu(self, key, job, gpu_mem, sm):
+        old = self.gpu.get(key)
+        if old is not None:
+            self._remove_gpu(key, old)
+        totals = self._totals(job)
+        totals.gpu_procs += 1
+        totals.gpu_mem += gpu_mem
+        totals.sm += sm
+        self.gpu[key] = (job, gpu_mem, sm)
+
+    def _remove_cpu(self, pid, entry):
+        job, cpu, rss = entry
+        totals = self.totals[job]
+        totals.procs -= 1
+        totals.cpu -= cpu
+        totals.rss -= rss
+        if not totals.procs:
+            totals.cpu = 0.0  # shed float drift once the job has no CPU entries
+        self._drop_if_empty(job)
+
+    def _remove_gpu(self, key, entry):
+        job, gpu_mem, sm = entry
+        totals = self.totals[job]
+        totals.gpu_procs -= 1
+        totals.gpu_mem -= gpu_mem
+        totals.sm -= sm
+        self._drop_if_empty(job)
+
+    def evict_cpu(self, live_pids):
+        for pid in self.cpu.keys() - live_pids:
+            self._remove_cpu(pid, self.cpu.pop(pid))
+
+    def evict_gpu(self, live_keys):
+        for key in self.gpu.keys() - live_keys:
+            self._remove_gpu(key, self.gpu.pop(key))
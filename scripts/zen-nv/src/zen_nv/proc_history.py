@@ -0,0 +1,112 @@
+from collections import deque
+
+from zen_nv.units import MIB
+
+
+# --- Per-Process GPU History ---
+class ProcessSeries:
+    """Bounded VRAM / SM history for one (pid, device) with a rolling least-squares fit.
+
+    The regression sums are updated on every append/evict so the slope costs
+    O(1) per sample regardless of window length. Memory is tracked in MiB and
+    time relative to the first sample to keep the sums well conditioned.
+    """
+
+    # Re-derive the running sums from the window every N appends to bound float drift
+    RESYNC_EVERY = 512
+
+    def __init__(self, window, t0):
+        self.t0 = t0
+        self.mem = deque(maxlen=window)  # (t, MiB)
+        self.sm = deque(maxlen=window)
+        self.sx = self.sy = self.sxx = self.sxy = self.syy = 0.0
+        self.appends = 0
+
+    def add(self, t, mem_mib, sm):
+        x = t - self.t0
+        if len(self.mem) == self.mem.maxlen:
+            ox, oy = self.mem[0]
+            self._accumulate(ox, oy, -1)
+        self.mem.append((x, mem_mib))
+        self.sm.append(sm)
+        self._accumulate(x, mem_mib, 1)
+
+        self.appends += 1
+        if self.appends % self.RESYNC_EVERY == 0:
+            self._resync()
+
+    def _accumulate(self, x, y, sign):
+        self.sx += sign * x
+        self.sy += sign * y
+        self.sxx += sign * x * x
+        self.sxy += sign * x * y
+        self.syy += sign * y * y
+
+    def _resync(self):
+        self.sx = self.sy = self.sxx = self.sxy = self.syy = 0.0
+        for x, y in self.mem:
+            self._accumulate(x, y, 1)
+
+    def fit(self):
+        """Return (slope MiB/s, r^2), or (0.0, 0.0) when the window is degenerate."""
+        n = len(self.mem)
+        if n < 2:
+            return 0.0, 0.0
+        vx = n * self.sxx - self.sx * self.sx
+        if vx <= 1e-9:
+            return 0.0, 0.0
+        cov = n * self.sxy - self.sx * self.sy
+        slope = cov / vx
+        vy = n * self.syy - self.sy * self.sy
+        r2 = (cov * cov) / (vx * vy) if vy > 1e-9 else 0.0
+        return slope, min(r2, 1.0)
+
+    @property
+    def last_mem(self):
+        return self.mem[-1][1] if self.mem else 0.0
+
+    @property
+    def last_sm(self):
+        return self.sm[-1] if self.sm else 0
+
+
+class ProcessHistory:
+    """Time series keyed by (pid, device index), evicted once the process disappears.
+
+    Footprint is O(live processes x window): `evict` drops every series whose
+    key was not reported in the latest scan.
+    """
+
+    def __init__(self, window=60, min_samples=10, leak_slope_mib_s=0.5, leak_r2=0.8):
+        self.window = window
+        self.min_samples = min_samples
+        self.leak_slope_mib_s = leak_slope_mib_s
+        self.leak_r2 = leak_r2
+        self.series = {}
+
+    def update(self, pid, device, t, mem_bytes, sm):
+        key = (pid, device)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = ProcessSeries(self.window, t)
+        series.add(t, mem_bytes / MIB, sm)
+        return series
+
+    def evict(self, live_keys):
+        for key in self.series.keys() - live_keys:
+            del self.series[key]
+
+    def trend(self, pid, device, free_bytes=None):
+        """Return (slope MiB/s, is_leak, seconds until OOM or None)."""
+        series = self.series.get((pid, device))
+        if series is None or len(series.mem) < self.min_samples:
+            return 0.0, False, None
+        slope, r2 = series.fit()
+        leak = slope >= self.leak_slope_mib_s and r2 >= self.leak_r2
+        eta = None
+        if leak and free_bytes is not None:
+            eta = (free_bytes / MIB) / slope
+        return slope, leak, eta
+
+    def __len__(self):
+        return len(self.series)
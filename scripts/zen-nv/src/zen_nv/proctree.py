@@ -0,0 +1,95 @@
+import time
+
+import psutil
+
+
+# --- Process Tree Sampling ---
+def _same_process(old, new):
+    # psutil caches create_time on the Process, so this costs no extra /proc read
+    if old is not None and old.create_time() == new.create_time():
+        return old
+    return new
+
+
+class TreeSample:
+    __slots__ = ("cpu", "io", "rss", "threads", "procs")
+
+    def __init__(self, cpu, io, rss, threads, procs):
+        self.cpu = cpu  # % of one CPU; None until there is a previous sample
+        self.io = io  # iowait %, same
+        self.rss = rss  # bytes
+        self.threads = threads
+        self.procs = procs
+
+
+class ProcessTree:
+    """CPU %, iowait %, RSS and threads summed over a process and its descendants.
+
+    The child list is re-read every `relist_s` seconds, keeping existing
+    Process objects unless the pid was reused. Rates are per-process deltas
+    keyed by (pid, create_time): a newly listed process counts from zero if
+    it started after the previous sample, otherwise its first reading is only
+    a baseline, and exited processes simply drop out. So neither a worker
+    found late nor one that exits distorts the tree's rate. cpu_times already
+    includes iowait (delayacct) on Linux, so each process costs one oneshot.
+    """
+
+    def __init__(self, root_pid, relist_s=10.0):
+        self.root_pid = root_pid
+        self.relist_s = relist_s
+        self.procs = {}  # pid -> psutil.Process (root and descendants)
+        self.listed = None
+        self.last = {}  # (pid, create_time) -> (cpu seconds, iowait seconds) at the previous sample
+        self.t = None
+        self.wall = None
+
+    def pids(self):
+        return self.procs.keys()
+
+    def _relist(self):
+        try:
+            root = self.procs.get(self.root_pid) or psutil.Process(self.root_pid)
+            procs = [root] + root.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self.procs = {}
+            return
+        self.procs = {p.pid: _same_process(self.procs.get(p.pid), p) for p in procs}
+
+    def sample(self, now=None):
+        """Return a TreeSample, or None when the root can't be listed (exited, no access)."""
+        now = time.monotonic() if now is None else now
+        wall = time.time()
+        if self.listed is None or now - self.listed >= self.relist_s or not self.procs:
+            self._relist()
+            self.listed = now
+        if not self.procs:
+            return None
+
+        cpu = io = 0.0
+        rss = threads = 0
+        last = {}
+        for pid, proc in list(self.procs.items()):
+            try:
+                with proc.oneshot():
+                    times = proc.cpu_times()
+                    mem = proc.memory_info().rss
+                    n_threads = proc.num_threads()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                del self.procs[pid]
+                continue
+            rss += mem
+            threads += n_threads
+            key = (pid, proc.create_time())
+            totals = last[key] = (times.user + times.system, getattr(times, "iowait", 0.0))
+            prev = self.last.get(key)
+            if prev is None:
+                prev = (0.0, 0.0) if self.wall is not None and key[1] >= self.wall else totals
+            cpu += max(0.0, totals[0] - prev[0])
+            io += max(0.0, totals[1] - prev[1])
+
+        prev_t = self.t
+        self.t, self.wall, self.last = now, wall, last
+        if prev_t is None or now <= prev_t:
+            return TreeSample(None, None, rss, threads, len(self.procs))
+        dt = now - prev_t
+        return TreeSample(cpu / dt * 100, io / dt * 100, rss, threads, len(self.procs))
@@ -0,0 +1,186 @@
+import gzip
+import json
+import struct
+import subprocess
+import time
+from array import array
+
+from zen_metrics import Collector
+
+from zen_nv.energy import EnergyMeter, format_energy
+from zen_nv.proctree import ProcessTree
+from zen_nv.units import MIB
+
+# One record per sample: t s, tree CPU %, GPU util % (mean of devices used),
+# RSS MiB, VRAM MiB, SM % (sum over the tree), power W (devices used)
+RECORD = struct.Struct("<fffIIff")
+FIELDS = ("t", "cpu", "gpu_util", "rss_mib", "vram_mib", "sm", "power_w")
+MAGIC = b"ZNVPROF1\n"
+GPU_IDLE_SM = 5
+
+
+# --- Trace Files ---
+def write_header(f, header):
+    f.write(MAGIC)
+    f.write(json.dumps(header).encode() + b"\n")
+
+
+def read_trace(path):
+    """Return (header, rows) from a trace written by `profile`; rows are FIELDS tuples."""
+    with gzip.open(path, "rb") as f:
+        if f.readline() != MAGIC:
+            raise ValueError(f"{path} is not a zen-nv profile trace")
+        header = json.loads(f.readline())
+        data = f.read()
+    usable = len(data) - len(data) % RECORD.size
+    return header, list(RECORD.iter_unpack(data[:usable]))
+
+
+# --- Profiling ---
+def percentiles(values):
+    if not values:
+        return {"p50": None, "p95": None, "max": None}
+    ordered = sorted(values)
+    n = len(ordered)
+    return {
+        "p50": round(ordered[(n - 1) // 2], 2),
+        "p95": round(ordered[min(n - 1, int(0.95 * (n - 1) + 0.5))], 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+def profile(command, interval=0.05, trace_path=None, collector=None):
+    """Run `command`, sample its process tree every `interval` s and return a report dict.
+
+    The raw samples go to `trace_path` as gzip-compressed fixed-size records
+    (see `RECORD`) after a JSON header line, for later A/B comparison.
+    """
+    collector = collector or Collector()
+    devices = collector.devices
+    start_wall = time.time()
+    t0 = time.monotonic()
+    child = subprocess.Popen(command)
+    tree = ProcessTree(child.pid, relist_s=0.5)
+
+    tree_pids = set()
+    meter = EnergyMeter(job_of=lambda pid: "command" if pid in tree_pids else "other")
+    used = set()  # device indices the tree has touched
+    first_gpu = None
+    first_idx = None
+    cols = {name: array("f") for name in FIELDS}
+
+    trace = gzip.open(trace_path, "wb") if trace_path else None
+    if trace:
+        write_header(trace, {"command": command, "interval": interval, "start": start_wall,
+                             "fields": FIELDS, "format": RECORD.format})
+
+    interrupted = False
+    next_t = t0
+    try:
+        while True:
+            done = child.poll() is not None
+            now = time.monotonic()
+            t = now - t0
+            sample = tree.sample(now)
+            cpu = (sample.cpu or 0.0) if sample else 0.0
+            rss = sample.rss if sample else 0
+            tree_pids = set(tree.pids())
+
+            vram = sm = 0
+            power = util = 0.0
+            for device in devices:
+                gpu = collector.gpu(device)
+                shares = {}
+                for proc, snap in collector.processes(device):
+                    shares[proc.pid] = snap.sm or 0
+                    if proc.pid in tree_pids:
+                        used.add(gpu.index)
+                        vram += snap.gpu_mem or 0
+                        sm += snap.sm or 0
+                meter.set_shares(gpu.index, shares)
+                meter.add_sample(gpu.index, gpu.power_w, gpu.util, now)
+                if gpu.index in used:
+                    power += gpu.power_w or 0
+                    util += gpu.util or 0
+            util = util / len(used) if used else 0.0
+            if first_gpu is None and sm > 0:
+                first_gpu, first_idx = t, len(cols["sm"])
+
+            record = (t, cpu, util, rss // MIB, vram // MIB, sm, power)
+            for name, value in zip(FIELDS, record):
+                cols[name].append(value)
+            if trace:
+                trace.write(RECORD.pack(*record))
+
+            if done:
+                break
+            next_t += interval
+            delay = next_t - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_t = time.monotonic()  # fell behind; don't try to catch up with a burst
+    except KeyboardInterrupt:
+        # The terminal delivered SIGINT to the command too; let it exit and still report
+        interrupted = True
+    finally:
+        code = child.wait()
+        if trace:
+            trace.close()
+
+    duration = time.monotonic() - t0
+    sm_vals = cols["sm"]
+    active = sm_vals[first_idx:] if first_idx is not None else array("f")
+    device_joules = sum(meter.devices[i].joules for i in used if i in meter.devices)
+    attributed = meter.jobs.get("command")
+    return {
+        "command": command,
+        "exit_code": code,
+        "interrupted": interrupted,
+        "duration_s": round(duration, 2),
+        "samples": len(sm_vals),
+        "interval_s": interval,
+        "gpus": sorted(used),
+        "cpu_percent": percentiles(cols["cpu"]),
+        "sm_percent": percentiles(sm_vals),
+        "gpu_util_percent": percentiles(cols["gpu_util"]),
+        "peak_rss_mib": int(max(cols["rss_mib"], default=0)),
+        "peak_vram_mib": int(max(cols["vram_mib"], default=0)),
+        "energy_j": round(device_joules, 1),
+        "attributed_energy_j": round(attributed.joules, 1) if attributed else 0.0,
+        "time_to_first_gpu_s": round(first_gpu, 2) if first_gpu is not None else None,
+        # Share of samples with SM below GPU_IDLE_SM, over the run and after the GPU first got work
+        "gpu_idle_fraction": round(sum(v < GPU_IDLE_SM for v in sm_vals) / len(sm_vals), 3) if sm_vals else None,
+        "gpu_idle_fraction_active": round(sum(v < GPU_IDLE_SM for v in active) / len(active), 3) if active else None,
+        "trace": trace_path,
+    }
+
+
+def print_report(report):
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    status = "interrupted" if report["interrupted"] else f"exit {report['exit_code']}"
+    console.print(f"[bold]{' '.join(report['command'])}[/]  {report['duration_s']:.1f}s  ({status}, "
+                  f"{report['samples']} samples, GPUs {report['gpus'] or '-'})")
+
+    def fmt(value, suffix=""):
+        return "N/A" if value is None else f"{value:.1f}{suffix}"
+
+    table = Table("Metric", "p50", "p95", "max", box=None)
+    for label, key in (("Tree CPU %", "cpu_percent"), ("SM %", "sm_percent"), ("GPU util %", "gpu_util_percent")):
+        stats = report[key]
+        table.add_row(label, fmt(stats["p50"]), fmt(stats["p95"]), fmt(stats["max"]))
+    console.print(table)
+
+    idle = report["gpu_idle_fraction"]
+    idle_active = report["gpu_idle_fraction_active"]
+    console.print(
+        f"Peak RSS {report['peak_rss_mib']} MiB · Peak VRAM {report['peak_vram_mib']} MiB\n"
+        f"Energy {format_energy(report['energy_j'])} (attributed {format_energy(report['attributed_energy_j'])})\n"
+        f"First GPU activity {fmt(report['time_to_first_gpu_s'], 's')} · "
+        f"GPU idle {fmt(idle and idle * 100, '%')} (after first activity {fmt(idle_active and idle_active * 100, '%')})"
+    )
+    if report["trace"]:
+        console.print(f"[dim]Trace: {report['trace']}[/]")
@@ -0,0 +1,97 @@
+import time
+
+
+# --- Adaptive Refresh Scheduling ---
+class Source:
+    """One refreshable data source with its own adaptive rate.
+
+    `fn` returns a coarse signature of what it sampled (or None). An unchanged
+    signature backs the interval off towards `max_interval`; any change snaps
+    it back to `interval`. Runs that exceed `budget_ms` stretch the interval so
+    the source's duty cycle stays bounded.
+    """
+
+    def __init__(self, name, fn, interval, max_interval=None, budget_ms=50.0, backoff=1.5):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.max_interval = max_interval or interval
+        self.budget_ms = budget_ms
+        self.backoff = backoff
+
+        self.current = interval
+        self.next_due = 0.0
+        self.last_sig = None
+        self.cost_ms = 0.0  # EWMA of run time
+        self.runs = 0
+
+    def run(self, now, slowdown=1.0):
+        t0 = time.perf_counter_ns()
+        sig = self.fn()
+        cost = (time.perf_counter_ns() - t0) / 1e6
+        self.cost_ms = cost if not self.runs else 0.8 * self.cost_ms + 0.2 * cost
+        self.runs += 1
+
+        if sig is not None and sig == self.last_sig:
+            self.current = min(self.current * self.backoff, self.max_interval)
+        else:
+            self.current = self.interval
+        self.last_sig = sig
+        self.next_due = now + self.effective_interval(slowdown)
+        return cost
+
+    def effective_interval(self, slowdown=1.0):
+        stretch = max(1.0, self.cost_ms / self.budget_ms) if self.budget_ms else 1.0
+        return self.current * stretch * slowdown
+
+
+class RefreshScheduler:
+    """Runs whichever sources are due on each base tick.
+
+    Due sources run most-overdue first; once `tick_budget_ms` is spent the rest
+    are deferred to the next tick (still overdue, so they go first), which
+    keeps one slow source from starving the others.
+    """
+
+    def __init__(self, tick_budget_ms=150.0, unfocused_slowdown=4.0):
+        self.tick_budget_ms = tick_budget_ms
+        self.unfocused_slowdown = unfocused_slowdown
+        self.focused = True
+        self.sources = {}
+
+    def add(self, name, fn, interval, **kwargs):
+        source = self.sources[name] = Source(name, fn, interval, **kwargs)
+        return source
+
+    def worst_interval(self, name):
+        # Longest a healthy source waits between runs: fully backed off while unfocused
+        return self.sources[name].max_interval * self.unfocused_slowdown
+
+    @property
+    def base_interval(self):
+        # Granularity of the driving timer: fine enough for the fastest source
+        if not self.sources:
+            return 1.0
+        return max(0.05, min(s.interval for s in self.sources.values()) / 4)
+
+    def tick(self, now=None, force=False):
+        now = time.monotonic() if now is None else now
+        slowdown = 1.0 if self.focused else self.unfocused_slowdown
+
+        due = [s for s in self.sources.values() if force or now >= s.next_due]
+        due.sort(key=lambda s: s.next_due)
+
+        spent = 0.0
+        for source in due:
+            if spent >= self.tick_budget_ms and not force:
+                break
+            spent += source.run(now, slowdown)
+        return spent
+
+    def set_focused(self, focused):
+        self.focused = focused
+        if focused:
+            # Pull deferred sources forward so the view catches up immediately
+            now = time.monotonic()
+            for source in self.sources.values():
+                source.next_due = min(source.next_due, now + source.interval)
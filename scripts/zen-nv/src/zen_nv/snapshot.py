@@ -0,0 +1,108 @@
+import socket
+import time
+
+import psutil
+from nvitop import HostProcess
+
+from zen_metrics import Collector
+
+from zen_nv.energy import JOULES_PER_KWH, format_energy
+
+
+# --- One-shot Sampling ---
+def _joules(mj):
+    return mj / 1000 if mj is not None else None
+
+
+def _kwh(joules):
+    return round(joules / JOULES_PER_KWH, 6) if joules is not None else None
+
+
+def take_snapshot(sample_interval=0.1, collector=None):
+    """Sample CPU, RAM, every GPU and its processes once and return plain data.
+
+    CPU% needs two readings, so this blocks for `sample_interval` seconds.
+    GPU util/W uses the mean of NVML's buffered util and power samples over
+    that same wait, falling back to point reads when the driver has none.
+    """
+    collector = collector or Collector()
+    for device in collector.devices:
+        collector.burst(device)  # mark where the driver's sample buffers end
+    host = collector.host(cpu_interval=sample_interval)
+    snap = {
+        'host': socket.gethostname(),
+        'time': time.time(),
+        'cpu': {'percent': host.cpu_percent, 'count': psutil.cpu_count()},
+        'ram': {'percent': host.ram_percent, 'used': host.ram_used, 'total': host.ram_total},
+        'gpus': [],
+        'processes': [],
+    }
+
+    for device in collector.devices:
+        gpu = collector.gpu(device)
+        burst = collector.burst(device)
+        util, watts = gpu.util, gpu.power_w
+        if burst is not None:
+            if burst.util is not None:
+                util = burst.util.mean
+            if burst.power is not None:
+                watts = burst.power.mean / 1000
+        energy_j = _joules(collector.total_energy_mj(device))
+        snap['gpus'].append({
+            'index': gpu.index,
+            'name': gpu.name,
+            'util': gpu.util,
+            'mem_used': gpu.mem_used,
+            'mem_total': gpu.mem_total,
+            'mem_percent': round(gpu.mem_percent, 1) if gpu.mem_used is not None else None,
+            'temp_c': gpu.temp_c,
+            'fan': gpu.fan,
+            'power_mw': gpu.power_mw,
+            'power_limit_mw': gpu.static.power_limit_mw,
+            'energy_j': energy_j,
+            'energy_kwh': _kwh(energy_j),
+            # Utilisation per watt (%/W) over the sample window; higher is more efficient
+            'util_per_watt': round(util / watts, 4) if util is not None and watts else None,
+        })
+        for proc, info in collector.processes(device):
+            entry = {'pid': info.pid, 'gpu': info.device, 'gpu_mem': info.gpu_mem, 'sm': info.sm, 'user': None, 'command': None}
+            try:
+                hp = HostProcess(proc.pid)
+                entry['user'] = hp.username()
+                entry['command'] = hp.command()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+            snap['processes'].append(entry)
+    return snap
+
+
+def print_table(snap):
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    console.print(
+        f"[bold]{snap['host']}[/]  CPU {snap['cpu']['percent']:.1f}%  "
+        f"RAM {snap['ram']['percent']:.1f}% "
+        f"({snap['ram']['used'] / 1024**3:.1f}/{snap['ram']['total'] / 1024**3:.1f} GB)"
+    )
+
+    def fmt(value, spec="", suffix=""):
+        return "N/A" if value is None else f"{value:{spec}}{suffix}"
+
+    gpus = Table("GPU", "Name", "Util", "VRAM", "Temp", "Power", "Energy", "Util/W", box=None)
+    for g in snap['gpus']:
+        mem = "N/A" if g['mem_used'] is None else f"{g['mem_used'] // 1048576}/{fmt(g['mem_total'] and g['mem_total'] // 1048576)} MiB"
+        power = fmt(g['power_mw'] and g['power_mw'] / 1000, ".0f", "W")
+        energy = "N/A" if g['energy_j'] is None else format_energy(g['energy_j'])
+        gpus.add_row(str(g['index']), g['name'], fmt(g['util'], "", "%"), mem, fmt(g['temp_c'], "", "°C"), power, energy,
+                     fmt(g['util_per_watt'], ".2f", "%/W"))
+    console.print(gpus)
+
+    if snap['processes']:
+        procs = Table("PID", "User", "GPU", "VRAM", "SM%", "Command", box=None)
+        procs.columns[-1].no_wrap = True
+        for p in snap['processes']:
+            vram = fmt(p['gpu_mem'] and p['gpu_mem'] // 1048576, "", " MiB")
+            procs.add_row(str(p['pid']), p['user'] or "?", str(p['gpu']), vram, fmt(p['sm']), p['command'] or "?")
+        console.print(procs)
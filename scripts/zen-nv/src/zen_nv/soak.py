@@ -0,0 +1,257 @@
+import gc
+import random
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+import psutil
+
+from zen_metrics import Collector
+
+from zen_nv.units import GIB, MIB
+
+# Above Linux's default pid_max (4194304), so simulated pids never match a real process
+SIM_PID_BASE = 1 << 23
+
+
+# --- Simulated Workload ---
+class SimulatedProcess:
+    __slots__ = ("pid", "mem", "sm", "steps_left")
+
+    def __init__(self, pid, mem, sm, steps_left):
+        self.pid = pid
+        self.mem = mem
+        self.sm = sm
+        self.steps_left = steps_left
+
+    def gpu_memory(self):
+        return self.mem
+
+    def gpu_sm_utilization(self):
+        return self.sm
+
+
+class SimulatedDevice:
+    """Just enough of nvitop's Device for the Collector, backed by a churning process set.
+
+    Every `processes()` call advances the simulation one step: `churn` new
+    short-lived processes start and those past their lifetime exit.
+    """
+
+    handle = None
+
+    def __init__(self, index, workload):
+        self.index = index
+        self.workload = workload
+        self.procs = {}
+
+    def step(self):
+        for pid in [pid for pid, p in self.procs.items() if p.steps_left <= 0]:
+            del self.procs[pid]
+        for p in self.procs.values():
+            p.steps_left -= 1
+            p.mem += random.randint(0, 8) * MIB
+            p.sm = random.randint(0, 100)
+        for _ in range(self.workload.churn):
+            pid = self.workload.next_pid()
+            self.procs[pid] = SimulatedProcess(
+                pid, random.randint(256, 4096) * MIB, random.randint(0, 100),
+                random.randint(1, self.workload.lifetime),
+            )
+
+    def processes(self):
+        self.step()
+        return dict(self.procs)
+
+    def name(self):
+        return f"Simulated GPU {self.index}"
+
+    def bus_id(self):
+        return None
+
+    def memory_total(self):
+        return 80 * GIB
+
+    def memory_used(self):
+        return min(80 * GIB, sum(p.mem for p in self.procs.values()))
+
+    def gpu_utilization(self):
+        return min(100, sum(p.sm for p in self.procs.values()) // max(1, len(self.procs)))
+
+    def temperature(self):
+        return 40 + self.gpu_utilization() // 3
+
+    def fan_speed(self):
+        return 30
+
+    def power_usage(self):
+        return 60000 + self.gpu_utilization() * 3000
+
+    def power_limit(self):
+        return 400000
+
+    def oneshot(self):
+        return nullcontext()
+
+
+class SimulatedWorkload:
+    def __init__(self, gpus=4, churn=20, lifetime=5):
+        self.churn = churn
+        self.lifetime = lifetime
+        self.pid = SIM_PID_BASE
+        self.spawned = 0
+        self.devices = [SimulatedDevice(i, self) for i in range(gpus)]
+
+    def next_pid(self):
+        self.pid += 1
+        self.spawned += 1
+        return self.pid
+
+
+# --- Soak Run ---
+# Entries a tracked structure may gain per live simulated process between the two halves after warmup
+MAX_STRUCTURE_GROWTH = 0.25
+STRUCTURES = ("proc_history", "energy_procs", "energy_jobs", "job_cache", "job_entries", "bottlenecks")
+
+
+def structure_sizes(app):
+    # Everything keyed by pid, job or device; these must stay flat under churn
+    from zen_nv import tui
+
+    return {
+        "proc_history": len(tui.proc_history),
+        "energy_procs": len(tui.energy.procs),
+        "energy_jobs": len(tui.energy.jobs),
+        "job_cache": len(tui.jobs.cache),
+        "job_entries": len(tui.job_totals.gpu) + len(tui.job_totals.cpu),
+        "bottlenecks": len(tui.bottlenecks.stats),
+        "gpu_rows": app.query_one("#proc-gpu").row_count,
+    }
+
+
+def run_soak(theme_config, duration=60.0, interval=0.05, gpus=4, churn=20, lifetime=5,
+             warmup=0.5, report_every=5.0, max_traced_growth_mib=16.0, max_rss_growth_mib=50.0, top=10):
+    """Run the TUI headless against a simulated high-churn workload and report memory over time.
+
+    tracemalloc is baselined once `warmup` of the run has passed, so one-off
+    allocations (imports, first renders, caches filling) are not counted as
+    growth. Textual's LRU render caches keep filling for a few minutes under
+    this much churn, so traced growth is only a coarse check. The precise one
+    compares each pid-keyed structure's peak size in the first and second
+    half after the baseline: peaks rather than point samples because the CPU
+    and GPU scans evict on different schedules, so sizes swing by up to the
+    live process count between samples.
+    """
+    from zen_nv.tui import ZenNVApp
+
+    workload = SimulatedWorkload(gpus, churn, lifetime)
+    app = ZenNVApp(theme_config=theme_config, interval=interval, collector=Collector(devices=workload.devices))
+    proc = psutil.Process()
+    samples = []
+    marks = {}  # "baseline" sample plus tracemalloc "start"/"end" snapshots
+
+    def record(t0):
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        sample = {
+            "t": round(time.monotonic() - t0, 1),
+            "rss_mib": round(proc.memory_info().rss / MIB, 1),
+            "traced_mib": round(current / MIB, 2),
+            "spawned": workload.spawned,
+            "live": sum(len(d.procs) for d in workload.devices),
+        }
+        sample.update(structure_sizes(app))
+        samples.append(sample)
+        return sample
+
+    async def pilot(pilot):
+        t0 = time.monotonic()
+        await pilot.pause(0.5)
+        next_report = report_every
+        while (elapsed := time.monotonic() - t0) < duration:
+            await pilot.pause(min(0.5, duration - elapsed))
+            elapsed = time.monotonic() - t0
+            if "baseline" not in marks and elapsed >= duration * warmup:
+                # Snapshot first: it stays resident, and its size must not count as RSS growth
+                marks["start"] = tracemalloc.take_snapshot()
+                marks["baseline"] = record(t0)
+            elif elapsed >= next_report:
+                record(t0)
+                next_report += report_every
+        record(t0)
+        marks["end"] = tracemalloc.take_snapshot()
+        app.exit()
+
+    tracemalloc.start()
+    try:
+        app.run(headless=True, size=(160, 50), auto_pilot=pilot)
+    finally:
+        tracemalloc.stop()
+
+    first = marks.get("baseline", samples[0] if samples else None)
+    last = samples[-1] if samples else None
+    traced_growth = last["traced_mib"] - first["traced_mib"] if first and last else 0.0
+    rss_growth = last["rss_mib"] - first["rss_mib"] if first and last else 0.0
+    # gpu_rows is capped by the table limit; the rest must not grow with the number spawned
+    after = samples[samples.index(first):] if first else []
+    early, late = after[:len(after) // 2], after[len(after) // 2:]
+    growth = {}
+    if early and late:
+        live = max(1, sum(s["live"] for s in after) / len(after))
+        for name in STRUCTURES:
+            growth[name] = round((max(s[name] for s in late) - max(s[name] for s in early)) / live, 3)
+    unbounded = [name for name, per_live in growth.items() if per_live > MAX_STRUCTURE_GROWTH]
+    allocators = []
+    if "start" in marks and "end" in marks:
+        for stat in marks["end"].compare_to(marks["start"], "lineno")[:top]:
+            frame = stat.traceback[0]
+            allocators.append({
+                "where": f"{frame.filename}:{frame.lineno}",
+                "growth_kib": round(stat.size_diff / 1024, 1),
+                "count_diff": stat.count_diff,
+            })
+    return {
+        "duration_s": duration,
+        "interval_s": interval,
+        "gpus": gpus,
+        "processes_spawned": workload.spawned,
+        "samples": samples,
+        "traced_growth_mib": round(traced_growth, 2),
+        "rss_growth_mib": round(rss_growth, 1),
+        "structure_growth_per_live": growth,
+        "unbounded_structures": unbounded,
+        "top_allocators": allocators,
+        "passed": (traced_growth <= max_traced_growth_mib and rss_growth <= max_rss_growth_mib
+                   and not unbounded),
+        "limits": {"traced_mib": max_traced_growth_mib, "rss_mib": max_rss_growth_mib},
+    }
+
+
+def print_soak(report):
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    console.print(f"[bold]zen-nv soak[/]  {report['duration_s']:.0f}s, {report['gpus']} simulated GPUs, "
+                  f"{report['processes_spawned']} processes spawned")
+    if report["samples"]:
+        columns = list(report["samples"][0])
+        table = Table(*columns, box=None)
+        for sample in report["samples"]:
+            table.add_row(*(str(sample[c]) for c in columns))
+        console.print(table)
+
+    if report["top_allocators"]:
+        allocs = Table("Top allocators since baseline", "KiB", "Blocks", box=None)
+        allocs.columns[0].no_wrap = True
+        for a in report["top_allocators"]:
+            allocs.add_row(a["where"], f"{a['growth_kib']:+.1f}", f"{a['count_diff']:+d}")
+        console.print(allocs)
+
+    verdict = "[bold green]PASS[/]" if report["passed"] else "[bold red]FAIL[/]"
+    if report["unbounded_structures"]:
+        growth = report["structure_growth_per_live"]
+        grown = ", ".join(f"{name} (+{growth[name]:.2f} per live process)" for name in report["unbounded_structures"])
+        console.print(f"[bold red]Growing with churn:[/] {grown}")
+    console.print(f"{verdict}  traced {report['traced_growth_mib']:+.2f} MiB (limit {report['limits']['traced_mib']}), "
+                  f"RSS {report['rss_growth_mib']:+.1f} MiB (limit {report['limits']['rss_mib']})")
@@ -0,0 +1,91 @@
+import re
+from bisect import bisect_left, insort
+
+
+# --- Incremental Top-K ---
+class TopKIndex:
+    """Table rows kept in sort order across refreshes.
+
+    Each row carries a tuple of raw per-column values next to its display
+    cells. An update moves only that row (bisect out, insort back in) and
+    skips it entirely when its sort value is unchanged, so a refresh never
+    re-sorts every process. `top()` walks from the best end and stops after
+    k rows that pass the filter. Only changing the sort column rebuilds.
+    """
+
+    def __init__(self, column=0, descending=True):
+        self.column = column
+        self.descending = descending
+        self.order = []  # sorted (sort value, key)
+        self.entries = {}  # key -> (values, row)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _remove(self, item):
+        i = bisect_left(self.order, item)
+        if i < len(self.order) and self.order[i] == item:
+            del self.order[i]
+
+    def upsert(self, key, values, row):
+        old = self.entries.get(key)
+        self.entries[key] = (values, row)
+        value = values[self.column]
+        if old is not None:
+            old_value = old[0][self.column]
+            if old_value == value:
+                return
+            self._remove((old_value, key))
+        insort(self.order, (value, key))
+
+    def discard(self, key):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self._remove((old[0][self.column], key))
+
+    def retain(self, live_keys):
+        for key in self.entries.keys() - live_keys:
+            self.discard(key)
+
+    def set_sort(self, column, descending):
+        if column != self.column:
+            self.column = column
+            self.order = sorted((values[column], key) for key, (values, _) in self.entries.items())
+        self.descending = descending
+
+    def top(self, k=None, match=None):
+        rows = []
+        walk = reversed(self.order) if self.descending else iter(self.order)
+        for _, key in walk:
+            values, row = self.entries[key]
+            if match is not None and not match(values):
+                continue
+            rows.append(row)
+            if k is not None and len(rows) >= k:
+                break
+        return rows
+
+
+# --- Row Filters ---
+def row_filter(text, user_col, cmd_col):
+    """`user:NAME ...` tokens (any of them) plus a case-insensitive command regex.
+
+    Returns None for an empty filter; raises `re.error` for a bad regex.
+    """
+    users = set()
+    pattern = []
+    for token in text.split():
+        if token.startswith("user:") and len(token) > 5:
+            users.add(token[5:])
+        else:
+            pattern.append(token)
+    regex = re.compile(" ".join(pattern), re.IGNORECASE) if pattern else None
+    if not users and regex is None:
+        return None
+
+    def match(values):
+        if users and values[user_col] not in users:
+            return False
+        return regex is None or regex.search(values[cmd_col]) is not None
+
+    return match
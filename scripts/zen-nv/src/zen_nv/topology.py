@@ -0,0 +1,122 @@
+import glob
+import os
+import re
+from array import array
+
+import psutil
+
+SYS_NODE = "/sys/devices/system/node"
+SYS_CPU = "/sys/devices/system/cpu"
+SYS_PCI = "/sys/bus/pci/devices"
+
+
+# --- Host Topology ---
+def parse_cpulist(text):
+    # "0-15,32-47" -> [0, ..., 15, 32, ..., 47]
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cpus.extend(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def pci_sysfs_id(bus_id):
+    # NVML uses an 8-digit domain ("00000000:3B:00.0"); sysfs uses 4 ("0000:3b:00.0")
+    if not bus_id or not isinstance(bus_id, str):
+        return None
+    domain, _, rest = bus_id.partition(":")
+    return f"{int(domain, 16):04x}:{rest}".lower()
+
+
+def gpu_numa_node(bus_id):
+    sysfs_id = pci_sysfs_id(bus_id)
+    if sysfs_id is None:
+        return None
+    node = _read(os.path.join(SYS_PCI, sysfs_id, "numa_node"))
+    if node is None or int(node) < 0:
+        return None
+    return int(node)
+
+
+class Topology:
+    """NUMA nodes with their CPUs and socket, read once from sysfs.
+
+    Hosts without NUMA information (containers, macOS) collapse into a
+    single node 0 holding every logical CPU.
+    """
+
+    def __init__(self):
+        n_cpus = psutil.cpu_count() or 1
+        self.nodes = {}
+        for path in sorted(glob.glob(os.path.join(SYS_NODE, "node[0-9]*")),
+                           key=lambda p: int(re.sub(r"\D", "", os.path.basename(p)))):
+            cpulist = _read(os.path.join(path, "cpulist"))
+            if cpulist:
+                node = int(os.path.basename(path)[4:])
+                self.nodes[node] = [c for c in parse_cpulist(cpulist) if c < n_cpus]
+        if not self.nodes:
+            self.nodes = {0: list(range(n_cpus))}
+
+        self.sockets = {}
+        for node, cpus in self.nodes.items():
+            pkg = _read(os.path.join(SYS_CPU, f"cpu{cpus[0]}", "topology", "physical_package_id")) if cpus else None
+            self.sockets[node] = int(pkg) if pkg is not None else 0
+
+        self.gpu_nodes = {}  # device index -> NUMA node
+
+    def add_gpu(self, index, bus_id):
+        node = gpu_numa_node(bus_id)
+        if node is not None:
+            self.gpu_nodes[index] = node
+        return node
+
+    def gpus_on(self, node):
+        return [i for i, n in sorted(self.gpu_nodes.items()) if n == node]
+
+
+# --- Per-CPU Utilisation ---
+class PerCpuSampler:
+    """Per-logical-CPU busy % from one batched `cpu_times(percpu=True)` call.
+
+    Busy and total jiffies are kept in flat arrays and differenced in a single
+    pass per tick, so cost stays linear and small at 256+ CPUs.
+    """
+
+    def __init__(self):
+        self.busy, self.total = self._read()
+        self.util = array("d", [0.0]) * len(self.total)
+
+    @staticmethod
+    def _read():
+        busy = array("d")
+        total = array("d")
+        for t in psutil.cpu_times(percpu=True):
+            # guest time is already included in user/nice on Linux
+            tot = sum(t) - getattr(t, "guest", 0.0) - getattr(t, "guest_nice", 0.0)
+            idle = t.idle + getattr(t, "iowait", 0.0)
+            busy.append(tot - idle)
+            total.append(tot)
+        return busy, total
+
+    def sample(self):
+        busy, total = self._read()
+        if len(total) == len(self.total):
+            self.util = array("d", [
+                100.0 * (b1 - b0) / (t1 - t0) if t1 > t0 else 0.0
+                for b0, b1, t0, t1 in zip(self.busy, busy, self.total, total)
+            ])
+        else:
+            # CPU hotplug changed the count; restart the deltas
+            self.util = array("d", [0.0]) * len(total)
+        self.busy, self.total = busy, total
+        return self.util
@@ -0,0 +1,1130 @@
+import nvitop
+from nvitop import HostProcess
+import psutil
+import plotext as plt
+from collections import deque
+from rich.text import Text
+from rich.markup import escape
+from rich.style import Style
+from rich.table import Table
+from rich.align import Align
+from rich.panel import Panel
+from rich.ansi import AnsiDecoder
+from textual.app import App, ComposeResult
+from textual.widgets import Header, Footer, Static, DataTable, Label, Input
+from textual.containers import Container, VerticalScroll, Horizontal, Vertical
+from textual.binding import Binding
+from textual.reactive import reactive
+import signal
+import os
+import re
+import time
+
+from zen_nv.proc_history import ProcessHistory
+from zen_nv.scheduler import RefreshScheduler
+from zen_nv.instrument import Instrumentation
+from zen_nv.alerts import AlertEngine, DEFAULT_RULES
+from zen_nv.topology import Topology, PerCpuSampler
+from zen_nv.energy import EnergyMeter, format_energy
+from zen_nv.topk import TopKIndex, row_filter
+from zen_nv.jobs import JobResolver, JobAggregator
+from zen_nv.iostats import IoSampler
+from zen_nv.bottleneck import BottleneckAnalyzer, GPU_BOUND, INPUT_BOUND, IO_BOUND
+from zen_metrics import Collector, gradient_color, temp_gradient_color
+from zen_metrics.collector import query
+
+# --- History Management ---
+class History:
+    def __init__(self, max_len=60):
+        self.max_len = max_len
+        self.cpu = deque([0]*max_len, maxlen=max_len)
+        self.ram = deque([0]*max_len, maxlen=max_len)
+        self.gpu_util = {}
+        self.gpu_util_min = {}  # per-tick band from NVML's buffered samples
+        self.gpu_util_max = {}
+        self.gpu_mem = {}
+        self.diag = {}  # index -> {metric: deque}
+        self.io = {}  # metric -> deque
+
+    def update_cpu(self, cpu, ram):
+        self.cpu.append(cpu)
+        self.ram.append(ram)
+
+    def update_gpu(self, index, util, mem, band=None):
+        if index not in self.gpu_util:
+            self.gpu_util[index] = deque([0]*self.max_len, maxlen=self.max_len)
+            self.gpu_util_min[index] = deque([0]*self.max_len, maxlen=self.max_len)
+            self.gpu_util_max[index] = deque([0]*self.max_len, maxlen=self.max_len)
+            self.gpu_mem[index] = deque([0]*self.max_len, maxlen=self.max_len)
+        lo, hi = band or (util, util)
+        self.gpu_util[index].append(util)
+        self.gpu_util_min[index].append(lo)
+        self.gpu_util_max[index].append(hi)
+        self.gpu_mem[index].append(mem)
+
+    def update_io(self, **metrics):
+        for name, value in metrics.items():
+            if name not in self.io:
+                self.io[name] = deque([0]*self.max_len, maxlen=self.max_len)
+            self.io[name].append(value or 0)
+
+    def update_diag(self, index, **metrics):
+        series = self.diag.setdefault(index, {})
+        for name, value in metrics.items():
+            if name not in series:
+                series[name] = deque([0]*self.max_len, maxlen=self.max_len)
+            series[name].append(value or 0)
+
+history = History()
+proc_history = ProcessHistory(window=history.max_len)
+perf = Instrumentation()
+jobs = JobResolver()
+job_totals = JobAggregator()
+energy = EnergyMeter(job_of=jobs.resolve)
+bottlenecks = BottleneckAnalyzer(window=history.max_len // 2)
+
+# --- Rendering Helpers ---
+def get_plotext_color(name):
+    # Map standard names to bright ANSI codes to match "bold" text in Rich
+    mapping = {
+        "red": 9,      # Bright Red
+        "green": 10,   # Bright Green
+        "yellow": 11,  # Bright Yellow
+        "blue": 12,    # Bright Blue
+        "magenta": 13, # Bright Magenta
+        "cyan": 14,    # Bright Cyan
+        "white": 15,   # Bright White
+        "black": 8     # Bright Black (Gray)
+    }
+    return mapping.get(name, name)
+
+def render_graph(datasets, width=50, height=15, theme_colors=None):
+    if not datasets: return ""
+    plt.clear_figure()
+    plt.plotsize(width, height)
+    plt.theme('clear')
+    plt.ylim(0, 100)
+    plt.yticks(range(0, 101, 10)) # Ticks every 10
+    plt.xfrequency(0)
+    plt.grid(False, False)
+    plt.frame(True)
+
+    for ds in datasets:
+        col = get_plotext_color(ds.get('color', 'white'))
+        if 'band' in ds:
+            # Min/max envelope drawn dim underneath its series
+            for edge in ds['band']:
+                plt.plot(list(edge), color=get_plotext_color("black"), marker="braille")
+        plt.plot(list(ds['data']), color=col, label=ds.get('label', ''), marker="braille")
+    
+    return plt.build()
+
+# Idle -> saturated, one style per 10% bucket (built once, shared by every cell)
+HEAT_STYLES = [Style(color=c) for c in (
+    "#3b4261", "#565f89", "#7aa2f7", "#7dcfff", "#9ece6a",
+    "#c3e88d", "#e0af68", "#ff9e64", "#f7768e", "#ff5370", "#ff5370",
+)]
+
+SPARK = "▁▂▃▄▅▆▇█"
+
+def sparkline(values, width):
+    # Last `width` percentages as block characters
+    vals = list(values)[-width:] if width > 0 else []
+    return "".join(SPARK[min(7, int(v) * 8 // 101)] for v in vals)
+
+def relative(values):
+    # Unbounded values (throughput) as % of the window's peak, for 0-100 graphs
+    peak = max(values, default=0)
+    return [v * 100 / peak for v in values] if peak else [0] * len(values)
+
+def scaled_sparkline(values, width):
+    vals = list(values)[-width:] if width > 0 else []
+    return sparkline(relative(vals), width)
+
+def throttle_strip(values, width):
+    # One mark per sample where a non-idle clock reason (bit 0x1) was active
+    vals = list(values)[-width:] if width > 0 else []
+    return "".join("▮" if int(v) & ~0x1 else " " for v in vals)
+
+def format_rate(kib_s):
+    # NVML throughputs are KiB/s
+    if kib_s is None:
+        return "N/A"
+    if kib_s >= 1048576:
+        return f"{kib_s / 1048576:.1f} GB/s"
+    if kib_s >= 1024:
+        return f"{kib_s / 1024:.0f} MB/s"
+    return f"{kib_s:.0f} KB/s"
+
+def record_gpu(app, gpu, burst=None):
+    # Feed one GPU sample into the history and the alert engine; returns the firing rules.
+    # With buffered NVML samples the history keeps the tick's mean and min/max band,
+    # and energy integrates the mean power instead of a point read.
+    util, band, watts = gpu.util or 0, None, gpu.power_w
+    if burst is not None:
+        if burst.util is not None:
+            util, band = burst.util.mean, (burst.util.min, burst.util.max)
+        if burst.power is not None:
+            watts = burst.power.mean / 1000
+    history.update_gpu(gpu.index, util, gpu.mem_percent, band)
+    energy.add_sample(gpu.index, watts, util)
+    alerts = app.alerts
+    alerts.update(gpu.index, util=gpu.util, vram=gpu.mem_percent if gpu.mem_used is not None else None,
+                  temp=gpu.temp_c, power=gpu.power_percent)
+    alerts.evaluate(gpu.index)
+    return alerts.firing(gpu.index)
+
+VERDICT_STYLES = {GPU_BOUND: "green", INPUT_BOUND: "bold yellow", IO_BOUND: "bold red"}
+
+def format_verdict(verdict):
+    if verdict is None:
+        return Text("")
+    return Text(verdict.label, style=VERDICT_STYLES.get(verdict.label, "dim"))
+
+def format_trend(slope, leak, eta):
+    # VRAM growth rate for the process table; leaks are highlighted with an OOM ETA
+    if abs(slope) < 0.05:
+        return Text("")
+    label = f"{slope:+.1f}M/s"
+    if not leak:
+        return Text(label, style="dim")
+    if eta is not None:
+        label += f" OOM {int(eta // 60)}m" if eta >= 60 else f" OOM {int(eta)}s"
+    return Text(f"▲ {label}", style="bold red")
+
+# --- Widgets ---
+class GraphWidget(Static):
+    def __init__(self, role="cpu", device_idx=None, theme_config=None, **kwargs):
+        super().__init__(**kwargs)
+        self.role = role
+        self.device_idx = device_idx
+        self.theme_config = theme_config
+
+    def update_graph(self):
+        # Use content_region size if available, else fallback
+        width = self.content_region.width or 40
+        height = self.content_region.height or 10
+        
+        # Ensure minimal size for plotext
+        width = max(20, width)
+        height = max(5, height)
+        
+        datasets = []
+        if self.role == "cpu":
+            datasets = [
+                {'data': history.cpu, 'label': 'CPU', 'color': self.theme_config['cpu_color']},
+                {'data': history.ram, 'label': 'RAM', 'color': self.theme_config['ram_color']}
+            ]
+        elif self.role == "gpu" and self.device_idx is not None:
+            datasets = [
+                {'data': history.gpu_util.get(self.device_idx, []), 'label': 'GPU', 'color': self.theme_config['gpu_color']},
+                {'data': history.gpu_mem.get(self.device_idx, []), 'label': 'VRAM', 'color': self.theme_config['mem_color']}
+            ]
+            if self.app.show_band and self.device_idx in history.gpu_util_min:
+                datasets[0]['band'] = (history.gpu_util_min[self.device_idx], history.gpu_util_max[self.device_idx])
+        elif self.role == "io":
+            # Throughput is drawn relative to its recent peak; exact rates are in the stats panel
+            datasets = [
+                {'data': relative(history.io.get('disk', [])), 'label': 'Disk', 'color': self.theme_config['disk_color']},
+                {'data': relative(history.io.get('net', [])), 'label': 'Net', 'color': self.theme_config['net_color']},
+            ]
+            if self.app.io.has_psi:
+                datasets.insert(0, {'data': history.io.get('psi_io', []), 'label': 'IO stall', 'color': self.theme_config['psi_color']})
+        
+        with perf.section("graphs"):
+            graph_ansi = render_graph(datasets, width=width, height=height)
+            self.update(Text.from_ansi(graph_ansi))
+
+class CoreHeatmapWidget(Static):
+    # One cell per logical CPU, grouped by NUMA node with the GPUs attached to it
+    def __init__(self, topology, **kwargs):
+        super().__init__(**kwargs)
+        self.topology = topology
+        self.sampler = PerCpuSampler()
+
+    def update_heatmap(self):
+        with perf.section("psutil"):
+            util = self.sampler.sample()
+
+        width = max(8, self.content_region.width or 40)
+        text = Text(no_wrap=True, overflow="crop")
+        sig = []
+        for node, cpus in self.topology.nodes.items():
+            vals = [util[c] for c in cpus if c < len(util)]
+            avg = sum(vals) / len(vals) if vals else 0.0
+            sig.append(round(avg / 5))
+
+            header = f"N{node} s{self.topology.sockets[node]} {avg:3.0f}%"
+            gpus = self.topology.gpus_on(node)
+            if gpus:
+                header += f"  GPU {','.join(map(str, gpus))}"
+            text.append(header + "\n", style="bold")
+
+            # Consecutive cells in the same bucket share a span, keeping segments few at 256+ CPUs
+            for start in range(0, len(vals), width):
+                run_bucket, run_len = None, 0
+                for v in vals[start:start + width]:
+                    bucket = min(10, int(v) // 10)
+                    if bucket != run_bucket and run_len:
+                        text.append("█" * run_len, style=HEAT_STYLES[run_bucket])
+                        run_len = 0
+                    run_bucket = bucket
+                    run_len += 1
+                if run_len:
+                    text.append("█" * run_len, style=HEAT_STYLES[run_bucket])
+                text.append("\n")
+
+        with perf.section("graphs"):
+            self.update(text)
+        return tuple(sig)
+
+class StatsWidget(Static):
+    def __init__(self, role="cpu", device=None, theme_config=None, **kwargs):
+        super().__init__(**kwargs)
+        self.role = role
+        self.device = device
+        self.theme_config = theme_config
+        self.static = None
+        self.numa = None
+
+    def refresh_static(self):
+        # Device properties that never (or rarely) change; refreshed on a slow schedule
+        if self.role == "gpu" and self.device:
+            self.static = self.app.collector.static(self.device)
+            self.numa = self.app.topology.gpu_nodes.get(self.device.index)
+
+    def update_stats(self):
+        # Returns a coarse signature of the sample so the scheduler can back off when stable
+        if self.role == "cpu":
+            with perf.section("psutil"):
+                host = self.app.collector.host()
+            cpu = host.cpu_percent
+            history.update_cpu(cpu, host.ram_percent)
+            
+            # Colors
+            c_col = self.theme_config['cpu_color']
+            r_col = self.theme_config['ram_color']
+            
+            # Contrast check for text
+            cpu_style = f"bold {c_col}"
+            ram_style = f"bold {r_col}"
+
+            content = (
+                f"[{cpu_style}]CPU: {cpu}%[/]\n"
+                f"[{ram_style}]RAM: {host.ram_percent}%[/]\n"
+                f"Used: {host.ram_used / (1024**3):.1f} GB\n"
+                f"Tot:  {host.ram_total / (1024**3):.1f} GB"
+            )
+            self.update(content)
+            return (round(cpu / 5), round(host.ram_percent))
+
+        elif self.role == "gpu" and self.device:
+            if self.static is None:
+                self.refresh_static()
+            with perf.section("nvml"):
+                gpu = self.app.collector.gpu(self.device)
+                burst = self.app.collector.burst(self.device)
+            firing = record_gpu(self.app, gpu, burst)
+            util = gpu.util or 0
+            # Range of the driver's sub-tick samples, when it buffers them
+            spread = f" [dim]{burst.util.min:.0f}–{burst.util.max:.0f}[/]" if burst and burst.util else ""
+            mem_used = gpu.mem_used or 0
+            mem_total = gpu.mem_total or 0
+            mem_pct = gpu.mem_percent
+            
+            temp_c = gpu.temp_c or 0
+            temp_f = (temp_c * 9/5) + 32
+            fan = gpu.fan or 0
+            power = gpu.power_w or 0
+            limit = gpu.power_limit_w or 0
+
+            alert_line = " ".join(f"[bold red]⚠ {rule.name}[/]" for rule in firing)
+            self.parent.set_class(bool(firing), "alerting")
+            numa = f" [dim]· NUMA {self.numa}[/]" if self.numa is not None else ""
+            acct = energy.device(gpu.index)
+            used = f"{format_energy(acct.joules)} · {acct.perf_per_watt:.2f}%/W" if acct else "-"
+
+            g_col = self.theme_config['gpu_color']
+            m_col = self.theme_config['mem_color']
+            
+            content = (
+                f"[bold]{self.static.name}[/]{numa}\n{alert_line}\n"
+                f"[{g_col}]GPU: {util}%[/]{spread}\n"
+                f"[{m_col}]VRAM: {mem_pct:.1f}%[/]\n"
+                f"{int(mem_used/1048576)}/{int(mem_total/1048576)} MiB\n\n"
+                f"Temp: {temp_f:.1f}°F\n"
+                f"Fan:  {fan}%\n"
+                f"Pwr:  {power:.0f}/{limit:.0f}W\n"
+                f"Enrg: {used}"
+            )
+            self.update(content)
+            return (util, round(mem_pct), temp_c)
+
+        elif self.role == "io":
+            with perf.section("psutil"):
+                sample = self.app.io.sample()
+            psi = sample.psi
+            disk = sample.disk_read + sample.disk_write
+            net = sample.net_rx + sample.net_tx
+            history.update_io(psi_io=psi.get('io', {}).get('some'), disk=disk, net=net)
+
+            def rate(bps):
+                return format_rate(bps / 1024)
+
+            lines = []
+            if psi:
+                lines.append("[bold]Stall[/]  some   full")
+                for resource in ("cpu", "memory", "io"):
+                    p = psi.get(resource)
+                    if p is not None:
+                        full = f"{p['full']:5.1f}%" if 'full' in p else ""
+                        lines.append(f"{resource[:3]:<6}{p.get('some', 0):5.1f}% {full}")
+            else:
+                lines.append("[dim]PSI unavailable[/]" if not self.app.io.has_psi else "[bold]Stall[/]")
+            d_col = self.theme_config['disk_color']
+            n_col = self.theme_config['net_color']
+            lines.append("")
+            lines.append(f"[bold {d_col}]Disk[/] R {rate(sample.disk_read)}")
+            lines.append(f"     W {rate(sample.disk_write)}")
+            lines.append(f"[bold {n_col}]Net[/]  ↓ {rate(sample.net_rx)}")
+            lines.append(f"     ↑ {rate(sample.net_tx)}")
+            # Busiest device of each kind, to tell a dataset disk from a scratch disk
+            if sample.disks and sample.disks[0][1] + sample.disks[0][2] > 0:
+                name, read, write = sample.disks[0]
+                lines.append(f"[dim]{name}: {rate(read + write)}[/]")
+            if sample.nics and sample.nics[0][1] + sample.nics[0][2] > 0:
+                name, rx, tx = sample.nics[0]
+                lines.append(f"[dim]{name}: {rate(rx + tx)}[/]")
+            self.update("\n".join(lines))
+            return (round(psi.get('io', {}).get('some', 0)), round(disk / 1e6), round(net / 1e6))
+
+class DenseGpuWidget(Static):
+    # Every GPU as one row of a single table: one batched read and one render per tick
+    def __init__(self, devices, **kwargs):
+        super().__init__(**kwargs)
+        self.devices = devices
+
+    def update_dense(self):
+        collector = self.app.collector
+        with perf.section("nvml"):
+            gpus = [collector.gpu(device) for device in self.devices]
+            bursts = [collector.burst(device) for device in self.devices]
+
+        spark_width = max(10, (self.content_region.width or 100) - 73)
+        table = Table(box=None, expand=True, padding=(0, 1), header_style="bold")
+        table.add_column("GPU", justify="right", width=3)
+        table.add_column("Name", no_wrap=True, max_width=18)
+        table.add_column("Util", justify="right", width=4)
+        table.add_column("VRAM", justify="right", width=13)
+        table.add_column("Temp", justify="right", width=5)
+        table.add_column("Power", justify="right", width=9)
+        table.add_column("Energy", justify="right", width=10)
+        table.add_column("Util history", no_wrap=True, ratio=1)
+
+        sig = []
+        spark = history.gpu_util_max if self.app.show_band else history.gpu_util
+        for gpu, burst in zip(gpus, bursts):
+            firing = record_gpu(self.app, gpu, burst)
+            util = gpu.util or 0
+            mem_pct = gpu.mem_percent
+            temp_c = gpu.temp_c or 0
+            sig.append((util, round(mem_pct), temp_c))
+
+            name = gpu.name.replace("NVIDIA ", "")
+            if firing:
+                name = Text(f"⚠ {name}", style="bold red")
+            mem_used = (gpu.mem_used or 0) // 1073741824
+            mem_total = (gpu.mem_total or 0) // 1073741824
+            table.add_row(
+                str(gpu.index),
+                name,
+                Text(f"{util}%", style=gradient_color(util)),
+                Text(f"{mem_used}/{mem_total}G {mem_pct:3.0f}%", style=gradient_color(mem_pct)),
+                Text(f"{temp_c}°C", style=temp_gradient_color(temp_c)),
+                Text(f"{gpu.power_w or 0:.0f}/{gpu.power_limit_w or 0:.0f}W", style=gradient_color(gpu.power_percent or 0)),
+                format_energy(acct.joules) if (acct := energy.device(gpu.index)) else "-",
+                Text(sparkline(spark.get(gpu.index, ()), spark_width), style=gradient_color(util)),
+            )
+
+        with perf.section("graphs"):
+            self.update(table)
+        return tuple(sig)
+
+class DiagnosticsWidget(Static):
+    # PCIe/NVLink throughput, clocks and throttle reasons; only sampled while shown
+    def __init__(self, devices, **kwargs):
+        super().__init__(**kwargs)
+        self.devices = devices
+
+    def update_diag(self):
+        if not self.display:
+            return None
+        collector = self.app.collector
+        with perf.section("nvml"):
+            diags = [collector.diagnostics(device) for device in self.devices]
+
+        # Each metric cell is its current value over a sparkline of that metric's history
+        spark_width = max(6, ((self.content_region.width or 100) - 40) // 6)
+        table = Table(box=None, expand=True, padding=(0, 1), header_style="bold")
+        table.add_column("GPU", justify="right", width=3)
+        for name in ("PCIe TX", "PCIe RX", "NVLink TX", "NVLink RX", "SM clk", "Mem clk"):
+            table.add_column(name, justify="right", no_wrap=True, width=spark_width)
+        table.add_column("Throttle", ratio=1, min_width=14, no_wrap=True)
+
+        def clock(cur, pct):
+            if cur is None:
+                return Text("N/A", style="dim")
+            # Low clocks are what this view exists to show: colour by distance below max
+            return Text(f"{cur} MHz", style=gradient_color(100 - pct) if pct is not None else "")
+
+        def cell(value, spark, style):
+            value = value if isinstance(value, Text) else Text(value)
+            return Text.assemble(value, "\n", (spark, style))
+
+        sig = []
+        for d in diags:
+            sm_pct = d.sm_clock_percent
+            mem_pct = d.mem_clock_percent
+            history.update_diag(d.index, pcie_tx=d.pcie_tx, pcie_rx=d.pcie_rx, nvlink_tx=d.nvlink_tx,
+                                nvlink_rx=d.nvlink_rx, sm_clock=sm_pct, mem_clock=mem_pct, throttle=d.throttle)
+            series = history.diag[d.index]
+            reasons = d.throttle_reasons
+            sig.append((d.index, d.sm_clock, d.mem_clock, d.throttle, (d.pcie_tx or 0) >> 10, (d.pcie_rx or 0) >> 10,
+                        (d.nvlink_tx or 0) >> 10, (d.nvlink_rx or 0) >> 10))
+
+            def rate(name, value, style):
+                if value is None:
+                    return Text("N/A", style="dim")
+                return cell(format_rate(value), scaled_sparkline(series[name], spark_width), style)
+
+            table.add_row(
+                str(d.index),
+                rate("pcie_tx", d.pcie_tx, "cyan"),
+                rate("pcie_rx", d.pcie_rx, "cyan"),
+                rate("nvlink_tx", d.nvlink_tx, "green"),
+                rate("nvlink_rx", d.nvlink_rx, "green"),
+                cell(clock(d.sm_clock, sm_pct), sparkline(series["sm_clock"], spark_width), "magenta"),
+                cell(clock(d.mem_clock, mem_pct), sparkline(series["mem_clock"], spark_width), "magenta"),
+                cell(Text(", ".join(reasons), style="bold red") if reasons else Text("none", style="dim"),
+                     throttle_strip(series["throttle"], spark_width), "red"),
+            )
+
+        with perf.section("graphs"):
+            self.update(table)
+        return tuple(sig)
+
+PROC_COLUMNS = {
+    "gpu": ("PID", "User", "GPU", "VRAM", "SM%", "Trend", "Bound", "Energy", "Command"),
+    "cpu": ("PID", "User", "CPU%", "MEM%", "Command"),
+}
+TEXT_COLUMNS = {"User", "Bound", "Command"}
+
+class SlotTable(DataTable):
+    # Rows are positional slots rewritten in place: a steady refresh only touches the
+    # cells that changed instead of recreating every Row object each tick
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.shown = []  # row tuple currently displayed in each slot
+
+    def sync_rows(self, rows):
+        shown = self.shown
+        columns = list(self.columns)
+        for i, row in enumerate(rows):
+            if i >= len(shown):
+                self.add_row(*row, key=str(i))
+                shown.append(row)
+                continue
+            old = shown[i]
+            if old == row:
+                continue
+            for col, (before, after) in enumerate(zip(old, row)):
+                if before != after:
+                    self.update_cell(str(i), columns[col], after)
+            shown[i] = row
+        while len(shown) > len(rows):
+            shown.pop()
+            self.remove_row(str(len(shown)))
+
+class FilterInput(Input):
+    # Live filter for one process table; Escape clears it and hands focus back
+    BINDINGS = [("escape", "close", "Close filter")]
+
+    def __init__(self, table, **kwargs):
+        super().__init__(placeholder="user:NAME and/or command regex", **kwargs)
+        self.table = table
+
+    def on_input_changed(self, event):
+        event.stop()
+        self.table.set_filter(event.value)
+        self.set_class(self.table.filter_error, "invalid")
+
+    def on_input_submitted(self, event):
+        event.stop()
+        self.table.focus()
+
+    def action_close(self):
+        self.value = ""
+        self.display = False
+        self.table.focus()
+
+class ProcessTableWidget(SlotTable):
+    BINDINGS = [
+        ("k", "kill_process", "Kill Process"),
+        ("s", "cycle_sort", "Sort"),
+        ("r", "reverse_sort", "Reverse"),
+        ("slash", "filter", "Filter"),
+    ]
+
+    def __init__(self, mode="gpu", collector=None, title="", **kwargs):
+        super().__init__(**kwargs)
+        self.mode = mode
+        self.collector = collector
+        self.heading = title
+        self.cursor_type = "row"
+        self.column_names = PROC_COLUMNS[mode]
+        # GPU mode shows every process; CPU mode only the busiest
+        self.limit = None if mode == "gpu" else 30
+        self.topk = TopKIndex(column=3 if mode == "gpu" else 2, descending=True)
+        self.match = None
+        self.filter_text = ""
+        self.filter_error = False
+        self.error_rows = []
+        self.add_columns(*self.column_names)
+        self.ram_total = psutil.virtual_memory().total
+
+    def on_mount(self):
+        self.header_label = self.parent.query_one(Label)
+        self.filter_input = self.parent.query_one(FilterInput)
+        self.update_header()
+
+    def action_kill_process(self):
+        row = self.get_row_at(self.cursor_coordinate.row)
+        if row:
+            pid = int(row[0])
+            try:
+                os.kill(pid, signal.SIGTERM)
+                self.notify(f"Sent SIGTERM to PID {pid}")
+            except Exception as e:
+                self.notify(f"Failed to kill PID {pid}: {e}", severity="error")
+
+    def on_data_table_row_selected(self, event):
+        # Enter on a GPU process explains its bottleneck verdict
+        if self.mode != "gpu":
+            return
+        row = self.get_row(event.row_key)
+        try:
+            verdict = bottlenecks.verdict(int(row[0]), int(row[2]))
+        except ValueError:
+            return
+        if verdict is None:
+            self.notify(f"PID {row[0]}: too few samples to classify yet")
+        else:
+            self.notify(f"PID {row[0]} on GPU {row[2]}\n{verdict.describe()}", title="Bottleneck")
+
+    # --- Sorting & Filtering ---
+    def sort_by(self, column, descending=None):
+        if descending is None:
+            if column == self.topk.column:
+                descending = not self.topk.descending
+            else:
+                descending = self.column_names[column] not in TEXT_COLUMNS
+        self.topk.set_sort(column, descending)
+        self.update_header()
+        self.render_rows()
+
+    def on_data_table_header_selected(self, event):
+        self.sort_by(event.column_index)
+
+    def action_cycle_sort(self):
+        column = (self.topk.column + 1) % len(self.column_names)
+        self.sort_by(column, self.column_names[column] not in TEXT_COLUMNS)
+
+    def action_reverse_sort(self):
+        self.sort_by(self.topk.column)
+
+    def action_filter(self):
+        self.filter_input.display = True
+        self.filter_input.focus()
+
+    def set_filter(self, text):
+        names = self.column_names
+        try:
+            self.match = row_filter(text, names.index("User"), names.index("Command"))
+            self.filter_error = False
+        except re.error:
+            # Keep the last valid filter while the regex is being typed
+            self.filter_error = True
+            return
+        self.filter_text = text.strip()
+        self.update_header()
+        self.render_rows()
+
+    def update_header(self):
+        arrow = "▼" if self.topk.descending else "▲"
+        text = f"[bold]{self.heading}[/]  [dim]sort: {self.column_names[self.topk.column]} {arrow}"
+        if self.filter_text:
+            text += f"  filter: {escape(self.filter_text)}"
+        self.header_label.update(text + "[/]")
+
+    # --- Refresh ---
+    def refresh_table(self):
+        if self.mode == "gpu":
+            self.scan_gpu()
+        else:
+            self.scan_cpu()
+        return self.render_rows()
+
+    def scan_gpu(self):
+        topk = self.topk
+        now = time.monotonic()
+        live = set()
+        self.error_rows = []
+        bottlenecks.begin_scan()
+        for device in self.collector.devices:
+            try:
+                with perf.section("nvml"):
+                    mem_total = self.collector.static(device).mem_total
+                    mem_used = query(device.memory_used)
+                    free = mem_total - mem_used if mem_total is not None and mem_used is not None else None
+                    samples = self.collector.processes(device)
+                self.app.alerts.update(device.index, procs=len(samples))
+                energy.set_shares(device.index, {p.pid: snap.sm or 0 for p, snap in samples})
+
+                for p, snap in samples:
+                    # Prepare fields with defaults
+                    vram_val = snap.gpu_mem or 0
+                    sm_val = snap.sm or 0
+                    vram_str = str(int(vram_val / 1048576)) if vram_val else "?"
+
+                    key = (p.pid, device.index)
+                    live.add(key)
+                    try:
+                        with perf.section("psutil"):
+                            # create_time keys the job cache, so a reused pid is resolved afresh
+                            create_time = HostProcess(p.pid).create_time()
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        create_time = 0.0
+                    job_totals.update_gpu(key, jobs.resolve(p.pid, create_time), vram_val, sm_val)
+                    proc_history.update(p.pid, device.index, now, vram_val, sm_val)
+                    slope, leak, eta = proc_history.trend(p.pid, device.index, free)
+                    with perf.section("psutil"):
+                        bottlenecks.update(p.pid, device.index, sm_val, now)
+                    verdict = bottlenecks.verdict(p.pid, device.index)
+                    acct = energy.process(p.pid, device.index)
+                    energy_str = f"{format_energy(acct.joules)} {acct.perf_per_watt:.2f}%/W" if acct else ""
+
+                    user_str = "?"
+                    cmd_str = "?"
+
+                    try:
+                        with perf.section("psutil"):
+                            hp = HostProcess(p.pid)
+                            user_str = hp.username()
+                            cmd = hp.command()
+                        if "python" in cmd: cmd = cmd.split("python")[-1].strip()
+                        cmd_str = cmd
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        user_str = "(root/sys)"
+                        cmd_str = "(hidden)"
+                    except Exception as e:
+                        cmd_str = f"(err: {str(e)})"
+
+                    values = (p.pid, user_str, device.index, vram_val, sm_val, slope,
+                              verdict.label if verdict else "", acct.joules if acct else 0.0, cmd_str)
+                    row = (str(p.pid), user_str, str(device.index), vram_str, str(sm_val),
+                           format_trend(slope, leak, eta), format_verdict(verdict), energy_str, cmd_str)
+                    topk.upsert(key, values, row)
+            except Exception as e:
+                # If device.processes() fails completely
+                self.error_rows.append(("ERR", "Error", str(device.index), str(e), "", "", "", "", ""))
+                continue
+        # Drop rows and series for processes that exited since the last scan
+        topk.retain(live)
+        job_totals.evict_gpu(live)
+        bottlenecks.evict(live)
+        proc_history.evict(live)
+        energy.evict(live)
+
+    def scan_cpu(self):
+        topk = self.topk
+        live = set()
+        alive = set()
+        with perf.section("psutil"):
+            for p in psutil.process_iter(['pid', 'username', 'cpu_percent', 'memory_percent', 'create_time', 'name', 'cmdline']):
+                try:
+                    info = p.info
+                    cpu = info['cpu_percent'] or 0.0
+                    mem = info['memory_percent'] or 0.0
+                    # Every process counts towards its job; cgroups are read once per process
+                    alive.add(info['pid'])
+                    job_totals.update_cpu(info['pid'], jobs.resolve(info['pid'], info['create_time']),
+                                          cpu, int(mem * self.ram_total / 100))
+                    # Filter out low usage to keep table clean
+                    if cpu > 0.1 or mem > 0.1:
+                        cmd = info['name']
+                        if info['cmdline']:
+                            cmd = " ".join(info['cmdline'])
+                            if "python" in cmd: cmd = cmd.split("python")[-1].strip()
+                        user = info['username'] or "?"
+                        pid = info['pid']
+                        live.add(pid)
+                        values = (pid, user, cpu, mem, cmd)
+                        row = (str(pid), user, f"{cpu:.1f}", f"{mem:.1f}", cmd)
+                        topk.upsert(pid, values, row)
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+        topk.retain(live)
+        job_totals.evict_cpu(alive)
+        jobs.evict(alive)
+
+    def render_rows(self):
+        rows = self.error_rows + self.topk.top(self.limit, self.match)
+        with perf.section("tables"):
+            self.sync_rows(rows)
+        return tuple((r[0], r[3]) for r in rows)
+
+class JobTableWidget(SlotTable):
+    # Processes grouped by SLURM job / container / cgroup; totals come from the process scans
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.cursor_type = "row"
+        self.add_columns("Job", "Procs", "CPU%", "RSS", "GPU Procs", "VRAM", "SM%", "Energy")
+
+    def update_jobs(self):
+        if not self.display:
+            return None
+        ranked = sorted(job_totals.totals.items(), key=lambda kv: (kv[1].gpu_mem, kv[1].cpu), reverse=True)
+        rows = []
+        for job, t in ranked:
+            acct = energy.jobs.get(job)
+            rows.append((
+                job,
+                str(t.procs),
+                f"{t.cpu:.1f}",
+                f"{t.rss / 1073741824:.1f}G",
+                str(t.gpu_procs) if t.gpu_procs else "",
+                str(t.gpu_mem // 1048576) if t.gpu_procs else "",
+                str(t.sm) if t.gpu_procs else "",
+                format_energy(acct.joules) if acct else "",
+            ))
+        with perf.section("tables"):
+            self.sync_rows(rows)
+        return tuple((r[0], r[2], r[5]) for r in rows)
+
+class OverheadWidget(Static):
+    # Toggleable overlay with zen-nv's own per-tick cost and footprint
+    def update_overhead(self, scheduler):
+        if not self.display:
+            return
+        info = perf.summary()
+        lines = ["[bold]zen-nv overhead[/]  (ms/tick avg · max)"]
+        for name, stat in info['sections'].items():
+            lines.append(f"{name:<8}{stat['avg_ms']:>8.2f} · {stat['max_ms']:.2f}")
+        lines.append("")
+        lines.append(f"CPU: {info['cpu_percent']:.1f}%  RSS: {info['rss_bytes'] / 1048576:.1f} MiB")
+        lines.append(f"Ticks: {info['ticks']}  Missed: {info['missed_ticks']}")
+        lines.append("")
+        for src in scheduler.sources.values():
+            lines.append(f"{src.name:<9}every {src.effective_interval():5.1f}s  {src.cost_ms:6.2f} ms")
+        self.update("\n".join(lines))
+
+# --- Main App ---
+class ZenNVApp(App):
+    BINDINGS = [
+        Binding("o", "toggle_overhead", "Overhead"),
+        Binding("d", "toggle_diagnostics", "Diagnostics"),
+        Binding("j", "toggle_jobs", "Jobs"),
+        Binding("b", "toggle_band", "Util band"),
+    ]
+
+    CSS = """
+    Screen {
+        layout: grid;
+        grid-size: 1 3;
+        /* Auto height for System row, 1fr for GPU, 1fr for Procs */
+        grid-rows: 14 1fr 1fr;
+        background: #000000;
+    }
+    
+    .box {
+        /* Generic box */
+        padding: 0 1;
+        margin: 0 0 1 0;
+    }
+    
+    #system-container {
+        layout: horizontal;
+        height: 100%;
+        border: round white; /* Unified border for System */
+    }
+    
+    #gpu-scroll {
+        layout: vertical;
+        margin-bottom: 1;
+        /* No border around the scroll area itself */
+    }
+    
+    .device-row {
+        layout: horizontal;
+        height: 12; /* Unified border per GPU, slightly shorter */
+        border: round white; 
+        margin-bottom: 1;
+    }
+
+    DenseGpuWidget {
+        height: auto;
+        border: round white;
+        padding: 0 1;
+    }
+
+    DiagnosticsWidget {
+        height: auto;
+        border: round cyan;
+        padding: 0 1;
+        display: none;
+    }
+
+    .device-row.alerting {
+        border: round red;
+    }
+    
+    #proc-container {
+        layout: horizontal;
+    }
+    
+    .proc-box {
+        width: 1fr;
+        height: 100%;
+        border: round white;
+        margin-right: 1;
+    }
+    
+    .proc-box:last-of-type {
+        margin-right: 0;
+    }
+
+    StatsWidget {
+        width: 1.2fr;
+        height: 100%;
+        border: none; /* No separate border */
+        margin-right: 1;
+    }
+    
+    StatsWidget.io {
+        margin-left: 1;
+    }
+
+    CoreHeatmapWidget {
+        width: 1.5fr;
+        height: 100%;
+        margin-right: 1;
+    }
+
+    GraphWidget {
+        width: 2fr;
+        height: 100%;
+        border: none; /* No separate border */
+    }
+    
+    DataTable {
+        background: $surface;
+        border: none;
+    }
+    
+    OverheadWidget {
+        dock: right;
+        layer: overlay;
+        width: 46;
+        height: auto;
+        padding: 0 1;
+        border: round yellow;
+        background: #000000;
+        display: none;
+    }
+
+    #jobs-box {
+        display: none;
+    }
+
+    FilterInput.proc-filter {
+        display: none;
+        height: 1;
+        border: none;
+        padding: 0 1;
+    }
+
+    FilterInput.invalid {
+        color: red;
+    }
+
+    Label.proc-header {
+        width: 100%;
+        text-align: center;
+        color: white;
+        padding-bottom: 1;
+    }
+    """
+
+    def __init__(self, theme_config, interval, stats_json=None, alerts=None, dense=None, dense_threshold=8,
+                 band=False, collector=None, **kwargs):
+        super().__init__(**kwargs)
+        self.show_band = band
+        self.theme_config = theme_config
+        self.interval = interval
+        self.stats_json = stats_json
+        self.alerts = alerts or AlertEngine(DEFAULT_RULES)
+        self.alerts.listeners.append(self.on_alert)
+        self.collector = collector or Collector()
+        self.devices = self.collector.devices
+        # Dense mode keeps per-tick cost flat on 8-16 GPU nodes: one widget instead of two per GPU
+        self.dense = dense if dense is not None else len(self.devices) >= dense_threshold
+        self.topology = Topology()
+        self.io = IoSampler()
+
+    def compose(self) -> ComposeResult:
+        # System Row
+        with Container(id="system-container", classes="box"):
+            yield StatsWidget(role="cpu", theme_config=self.theme_config)
+            yield CoreHeatmapWidget(self.topology)
+            yield GraphWidget(role="cpu", theme_config=self.theme_config)
+            yield StatsWidget(role="io", theme_config=self.theme_config, classes="io")
+            yield GraphWidget(role="io", theme_config=self.theme_config, classes="io")
+
+        # GPU Scrollable Area (Explicitly added background class logic via CSS)
+        with VerticalScroll(id="gpu-scroll"):
+            yield DiagnosticsWidget(self.devices)
+            if self.dense:
+                yield DenseGpuWidget(self.devices)
+            else:
+                for i, device in enumerate(self.devices):
+                    with Container(classes="device-row"):
+                        yield StatsWidget(role="gpu", device=device, theme_config=self.theme_config)
+                        yield GraphWidget(role="gpu", device_idx=i, theme_config=self.theme_config)
+
+        # Process Tables (Split View)
+        with Container(id="proc-container"):
+            # CPU Processes
+            with Vertical(classes="proc-box", id="cpu-box"):
+                yield Label("[bold]Top System Processes[/]", classes="proc-header")
+                table = ProcessTableWidget(mode="cpu", title="Top System Processes", id="proc-cpu")
+                yield FilterInput(table, classes="proc-filter")
+                yield table
+            
+            # Jobs (replaces the CPU table when toggled)
+            with Vertical(classes="proc-box", id="jobs-box"):
+                yield Label("[bold]Jobs[/]  [dim]SLURM job · container · cgroup[/]", classes="proc-header")
+                yield JobTableWidget(id="jobs")
+
+            # GPU Processes
+            with Vertical(classes="proc-box"):
+                yield Label("[bold]Active GPU Processes[/]", classes="proc-header")
+                table = ProcessTableWidget(mode="gpu", collector=self.collector, title="Active GPU Processes", id="proc-gpu")
+                yield FilterInput(table, classes="proc-filter")
+                yield table
+        
+        yield OverheadWidget(id="overhead")
+        yield Footer()
+
+    def on_mount(self):
+        self.title = f"Zen-NV ({self.theme_config['name']})"
+
+        # Per-source rates: utilisation is fast, process scans slower, static info rare
+        i = self.interval
+        # Resolve widgets once; a per-tick query would also fail while the app is shutting down
+        proc_cpu = self.query_one("#proc-cpu", ProcessTableWidget)
+        proc_gpu = self.query_one("#proc-gpu", ProcessTableWidget)
+        self.overhead = self.query_one(OverheadWidget)
+        heatmap = self.query_one(CoreHeatmapWidget)
+        self.diagnostics = self.query_one(DiagnosticsWidget)
+        self.job_table = self.query_one(JobTableWidget)
+        self.scheduler = RefreshScheduler(tick_budget_ms=max(50.0, i * 250))
+        self.scheduler.add("cpu", lambda: self.refresh_role("cpu"), i, max_interval=i * 4, budget_ms=20)
+        self.register_gpus()
+        if self.dense:
+            refresh_gpus = self.query_one(DenseGpuWidget).update_dense
+        else:
+            def refresh_gpus():
+                return self.refresh_role("gpu")
+        self.scheduler.add("gpu", refresh_gpus, i, max_interval=i * 4, budget_ms=40)
+        # Back-off and an unfocused terminal space GPU samples up to 16x the interval apart;
+        # only a gap well beyond that (suspend, a hung driver) is left unintegrated
+        energy.max_gap = max(energy.max_gap, self.scheduler.worst_interval("gpu") * 3)
+        self.scheduler.add("io", lambda: self.refresh_role("io"), i, max_interval=i * 4, budget_ms=20)
+        self.scheduler.add("cores", heatmap.update_heatmap, i, max_interval=i * 4, budget_ms=20)
+        # Throughputs are counter diffs, so a slower poll just averages over a longer window
+        self.scheduler.add("diag", self.diagnostics.update_diag, i * 2, max_interval=i * 8, budget_ms=20)
+        self.scheduler.add("proc-gpu", proc_gpu.refresh_table, i * 2, max_interval=i * 10, budget_ms=60)
+        self.scheduler.add("proc-cpu", proc_cpu.refresh_table, i * 3, max_interval=i * 15, budget_ms=80)
+        self.scheduler.add("jobs", self.job_table.update_jobs, i * 2, max_interval=i * 10, budget_ms=20)
+        self.scheduler.add("static", self.refresh_static, 60.0, budget_ms=100)
+        self.scheduler.add("overhead", lambda: self.overhead.update_overhead(self.scheduler), 1.0, budget_ms=5)
+
+        self.set_interval(self.scheduler.base_interval, self.update_ui)
+        self.update_ui(force=True) # Initial call
+
+    def refresh_role(self, role):
+        # Stats feed the history, so graphs for the role redraw right after them
+        sig = []
+        for widget in self.query(StatsWidget):
+            if widget.role == role:
+                sig.append(widget.update_stats())
+        for widget in self.query(GraphWidget):
+            if widget.role == role:
+                widget.update_graph()
+        return tuple(sig)
+
+    def register_gpus(self):
+        # GPU -> NUMA node for the core heatmap labels; dense mode has no per-GPU StatsWidget to do it
+        for device in self.devices:
+            self.topology.add_gpu(device.index, self.collector.static(device).bus_id)
+
+    def refresh_static(self):
+        self.collector.refresh_static()
+        self.register_gpus()
+        for widget in self.query(StatsWidget):
+            widget.refresh_static()
+
+    def update_ui(self, force=False):
+        perf.begin_tick(self.scheduler.base_interval)
+        spent = self.scheduler.tick(force=force)
+        perf.end_tick(record=spent > 0)
+
+    def on_alert(self, event):
+        if event.firing:
+            self.notify(event.describe(), title="zen-nv alert", severity="error", timeout=10)
+        else:
+            self.notify(event.describe(), title="zen-nv alert", severity="information")
+
+    def action_toggle_overhead(self):
+        self.overhead.display = not self.overhead.display
+        self.overhead.update_overhead(self.scheduler)
+
+    def action_toggle_diagnostics(self):
+        self.diagnostics.display = not self.diagnostics.display
+        self.diagnostics.update_diag()
+
+    def action_toggle_band(self):
+        self.show_band = not self.show_band
+        for widget in self.query(GraphWidget):
+            if widget.role == "gpu":
+                widget.update_graph()
+
+    def action_toggle_jobs(self):
+        jobs_box = self.query_one("#jobs-box")
+        jobs_box.display = not jobs_box.display
+        self.query_one("#cpu-box").display = not jobs_box.display
+        self.job_table.update_jobs()
+
+    def on_unmount(self):
+        if self.stats_json:
+            sources = {
+                s.name: {"interval_s": round(s.effective_interval(), 3), "cost_ms": round(s.cost_ms, 3)}
+                for s in self.scheduler.sources.values()
+            }
+            perf.dump(self.stats_json, extra={"sources": sources, "energy": energy.summary()})
+
+    def on_app_focus(self):
+        self.scheduler.set_focused(True)
+
+    def on_app_blur(self):
+        self.scheduler.set_focused(False)
@@ -0,0 +1,3 @@
+# Byte sizes shared by the process tables, reports and the soak simulation
+MIB = 1048576
+GIB = 1073741824